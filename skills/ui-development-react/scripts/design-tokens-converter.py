@@ -8,27 +8,75 @@ Converts design tokens between multiple formats:
 - CSS (CSS custom properties)
 - Tailwind (Tailwind CSS config)
 
-Supports both light and dark mode token generation.
+Supports light and dark mode plus any number of theme modes, layered
+from one or more token files. Values may reference other tokens as
+``{colors.primary.main}``; references are resolved before any output is
+generated. Every token file is validated and normalized (color case, short
+hex, rgb()/hsl(), units, names) by design_tokens_schema.py, which the
+validator shares. With --watch the converter stays resident and regenerates the
+outputs affected by each change to the token files, the ``batch``
+command builds every token set of a manifest in one process, and the
+``diff`` command reports what changed between two token sets and can write
+minimal CSS/TypeScript patches holding only the changes.
+
+Library use (the file name is not a module name, so load it by path;
+importing does not switch to the project .venv):
+
+    import importlib.util
+    spec = importlib.util.spec_from_file_location('design_tokens_converter', path)
+    converter_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(converter_module)
+
+    converter = converter_module.DesignTokensConverter('tokens/design-tokens.json')
+    css = converter.generate('css')                  # whole output as a str
+    converter.stream('typescript', fp, mode='dark')  # any text or binary file object
+    converter.write_file('json', 'dist/tokens.json') # atomic; False if unchanged
+
+None of these print; ``convert``, ``build`` and the ``to_*`` methods report
+what they wrote on stdout like the command line does.
 """
 
+import io
 import os
+import re
 import sys
+import time
+import threading
 import json
 from pathlib import Path
 import argparse
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Sequence, Set, Tuple, Union
 
 
 def _activate_project_venv():
-    """Auto-detect project .venv and switch to it"""
+    """Auto-detect project .venv and switch to it
+
+    The re-exec is skipped when the running interpreter already belongs to
+    that venv, or when ACP_NO_VENV_REEXEC is set or --no-venv-reexec is
+    passed. The flag is exported as ACP_NO_VENV_REEXEC so worker processes
+    inherit it. The venv found (empty if none) is exported as
+    ACP_PROJECT_VENV; hooks can set it themselves to skip the parent
+    directory search.
+    """
+    if '--no-venv-reexec' in sys.argv:
+        os.environ['ACP_NO_VENV_REEXEC'] = '1'
     here = Path(__file__).resolve()
     parents = list(here.parent.parent.parents)
-    for p in parents:
-        vpy = p / '.venv' / 'bin' / 'python3'
-        if vpy.exists():
-            if sys.executable != str(vpy):
-                os.execv(str(vpy), [str(vpy)] + sys.argv)
-            break
+
+    venv = os.environ.get('ACP_PROJECT_VENV')
+    if venv is None:
+        venv = ''
+        for p in parents:
+            if (p / '.venv' / 'bin' / 'python3').exists():
+                venv = str(p / '.venv')
+                break
+        os.environ['ACP_PROJECT_VENV'] = venv
+
+    reexec = not os.environ.get('ACP_NO_VENV_REEXEC')
+    if reexec and venv and os.path.realpath(sys.prefix) != os.path.realpath(venv):
+        vpy = os.path.join(venv, 'bin', 'python3')
+        os.execv(vpy, [vpy] + sys.argv)
+
     # Auto-detect and add scripts directory for cross-script imports
     for p in parents:
         scripts_dir = p / '.claude' / 'scripts'
@@ -39,40 +87,438 @@ def _activate_project_venv():
             break
 
 
-_activate_project_venv()
+if __name__ == '__main__':
+    # Importing the converter as a library must not re-exec the host interpreter
+    _activate_project_venv()
+
+# design_tokens_schema.py sits next to this script, however the script is loaded
+_SCRIPTS_DIR = str(Path(__file__).resolve().parent)
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+
+from design_tokens_schema import default_mode, load_tokens, rebuild_tokens, resolve_table  # noqa: E402
+
+
+# Output file of each target format in `--to all` builds
+TARGET_FILES = {
+    'typescript': 'design-tokens.ts',
+    'css': 'design-tokens.css',
+    'tailwind': 'tailwind.config.js',
+    'json': 'design-tokens.json',
+}
+
+# How each target format is named in progress messages
+TARGET_LABELS = {
+    'typescript': 'TypeScript tokens',
+    'css': 'CSS tokens',
+    'tailwind': 'Tailwind config',
+    'json': 'JSON tokens',
+}
+
+# CSS custom property prefix of each non-color token group in CSS output
+CSS_PROPERTIES = {
+    'spacing.': '--space-',
+    'typography.sizes.': '--font-size-',
+    'effects.shadows.': '--shadow-',
+    'effects.radii.': '--radius-',
+}
+
+# Target formats holding a single mode; with mode "all" they get one output per mode
+PER_MODE_TARGETS = ('typescript', 'json')
+
+
+def ts_key(name: str, quote: bool = False) -> str:
+    """A property name for a TypeScript/JavaScript object literal
+
+    Names that are not identifiers (``2xl``, ``primary-500``) are quoted;
+    ``quote`` quotes every name.
+    """
+    if not quote and re.fullmatch(r'[A-Za-z_$][\w$]*', name):
+        return name
+    return ts_value(name)
+
+
+def ts_value(value: Any) -> str:
+    """A TypeScript/JavaScript literal for a token value"""
+    if isinstance(value, str):
+        escaped = value.replace('\\', '\\\\')
+        if "'" in value and '"' not in value:
+            return '"' + escaped + '"'
+        return "'" + escaped.replace("'", "\\'") + "'"
+    return json.dumps(value)
 
 
 class DesignTokensConverter:
-    """Convert design tokens between formats"""
+    """Convert design tokens between formats
+
+    The token files are merged, their references resolved into a flat
+    table (``table``) and the result parsed once into an intermediate
+    representation (``ir``) that every generator reads, so any number of
+    targets and themes can be emitted from one converter. ``tokens`` is the
+    resolved token tree; ``source_tokens`` keeps the references.
+    """
+
+    def __init__(self, tokens_path: Union[str, Sequence[str]]):
+        """Initialize with the path to tokens.json, or several token files to layer"""
+        paths = [tokens_path] if isinstance(tokens_path, (str, os.PathLike)) else list(tokens_path)
+        if not paths:
+            raise ValueError("No token file given")
+        self.tokens_paths = [Path(p) for p in paths]
+        self.tokens_path = self.tokens_paths[0]
+        self._parsed: Dict[Path, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._load()
 
-    def __init__(self, tokens_path: str):
-        """Initialize with path to tokens.json file"""
-        self.tokens_path = Path(tokens_path)
-        self.tokens = self._load_tokens()
+    def _load(self) -> None:
+        """Read the token files and derive every resolved structure from them"""
+        self.source_tokens = self._load_tokens()
+        self.modes = list(self.source_tokens.get('modes', {}))
+        self.default_mode = default_mode(self.source_tokens)
+        source = ', '.join(str(path) for path in self.tokens_paths)
+        self.table = resolve_table(self.source_tokens, self.default_mode, source)
+        self.tokens = rebuild_tokens(self.source_tokens, self.table)
+        self.ir = self._compile()
 
     def _load_tokens(self) -> Dict[str, Any]:
-        """Load tokens from JSON file"""
-        if not self.tokens_path.exists():
-            raise FileNotFoundError(f"Token file not found: {self.tokens_path}")
+        """Load tokens from the JSON file(s), later files overriding earlier ones
 
-        with open(self.tokens_path, 'r') as f:
-            return json.load(f)
+        A base token set can be followed by brand files that only add their
+        own modes or override a few values; everything else is shared. Each
+        file is validated and normalized on load. Parsed files are kept by
+        (mtime, size), so reloads only re-read files that changed.
+        """
+        tokens: Dict[str, Any] = {}
+        for path in self.tokens_paths:
+            if not path.exists():
+                raise FileNotFoundError(f"Token file not found: {path}")
 
-    def to_typescript(self, output_path: str, mode: str = 'light') -> None:
-        """Convert tokens to TypeScript format"""
-        ts_content = self._generate_typescript(mode)
-        Path(output_path).write_text(ts_content)
-        print(f"✓ Generated TypeScript tokens: {output_path}")
+            st = path.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = self._parsed.get(path)
+            if cached is None or cached[0] != stamp:
+                cached = self._parsed[path] = (stamp, load_tokens(path))
+            tokens = self._merge_tokens(tokens, cached[1])
+        return tokens
 
-    def _generate_typescript(self, mode: str) -> str:
-        """Generate TypeScript content"""
+    def _sections(self) -> Dict[str, Any]:
+        """Resolved token sections that outputs depend on, by name
+
+        Each mode is its own section (``modes.<mode>``); the other top-level
+        keys are sections under their own names, and ``modes`` is the
+        ordered list of mode names.
+        """
+        sections = {key: value for key, value in self.tokens.items() if key != 'modes'}
+        sections['modes'] = list(self.modes)
+        for mode, values in self.tokens.get('modes', {}).items():
+            sections[f"modes.{mode}"] = values
+        return sections
+
+    def reload(self) -> Set[str]:
+        """Re-read the token files and return the names of the sections that changed"""
+        before = self._sections()
+        self._load()
+        after = self._sections()
+        return {name for name in before.keys() | after.keys() if before.get(name) != after.get(name)}
+
+    def target_sections(self, target: Dict[str, Any]) -> Set[str]:
+        """Names of the sections a target's output is generated from"""
+        to_format = target['to']
+        mode = target.get('mode') or self.default_mode
+        if to_format == 'css':
+            return {'modes', 'spacing', 'typography', 'effects'} | {f"modes.{m}" for m in self.modes}
+        if to_format == 'tailwind':
+            return {'modes', 'spacing', f"modes.{self.default_mode}"}
+        sections = {'modes', 'spacing', 'typography', 'effects', f"modes.{mode}",
+                    f"modes.{self.default_mode}"}
+        if to_format == 'json':
+            sections.add('version')
+        return sections
+
+    @staticmethod
+    def _merge_tokens(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+        """Deep-merge ``overlay`` over ``base``; objects merge, other values replace"""
+        merged = dict(base)
+        for key, value in overlay.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = DesignTokensConverter._merge_tokens(merged[key], value)
+            else:
+                merged[key] = value
+        return merged
+
+    def _compile(self) -> Dict[str, Any]:
+        """Walk the tokens once into the representation the generators share
+
+        Colors are kept per mode as (category, [(name, value), ...]) groups,
+        once as each mode defines them (``colors``, for CSS blocks that
+        cascade over :root) and once as the full palette a mode sees
+        (``palettes``, see ``mode_tokens``); spacing as (name, value) pairs; typography and effects as
+        (category, [(name, value), ...]) groups, except that typography
+        entries that are not objects (fontFamily) keep their value. Source
+        order and values are kept.
+        """
+        modes = self.tokens.get('modes', {})
+        return {
+            'colors': {
+                mode: [(category, list(color_values.items()))
+                       for category, color_values in values.get('colors', {}).items()]
+                for mode, values in modes.items()
+            },
+            'palettes': {
+                mode: [(category, list(color_values.items()))
+                       for category, color_values in self.mode_tokens(mode).get('colors', {}).items()]
+                for mode in modes
+            },
+            'spacing': list(self.tokens.get('spacing', {}).items()),
+            'typography': [
+                (category, list(values.items()) if isinstance(values, dict) else values)
+                for category, values in self.tokens.get('typography', {}).items()
+            ],
+            'effects': [
+                (category, list(effect_values.items()))
+                for category, effect_values in self.tokens.get('effects', {}).items()
+                if isinstance(effect_values, dict)
+            ],
+        }
+
+    def mode_tokens(self, mode: str) -> Dict[str, Any]:
+        """Resolved values of a mode, taking what it leaves out from the default mode
+
+        Brand overlays usually override a few colors; like the scoped CSS,
+        which cascades over :root, per-mode output inherits the rest.
+        """
         modes = self.tokens.get('modes', {})
-        colors = modes.get(mode, {}).get('colors', {})
-        spacing = self.tokens.get('spacing', {})
-        typography = self.tokens.get('typography', {})
-        effects = self.tokens.get('effects', {})
+        values = modes.get(mode, {})
+        if mode == self.default_mode:
+            return values
+        return self._merge_tokens(modes.get(self.default_mode, {}), values)
+
+    def iter_chunks(self, to_format: str, mode: Optional[str] = None) -> Iterator[str]:
+        """Generate one target format as a stream of text chunks
+
+        ``mode`` selects the palette of TypeScript and JSON output (default:
+        the default mode); CSS and Tailwind output ignore it.
+        """
+        self._check_mode(mode)
+        if to_format == 'typescript':
+            return self._typescript_chunks(mode or self.default_mode)
+        if to_format == 'css':
+            return self._css_chunks()
+        if to_format == 'tailwind':
+            return self._tailwind_chunks()
+        if to_format == 'json':
+            return self._json_chunks(mode or self.default_mode)
+        raise ValueError(f"Unknown target format: {to_format}")
+
+    def generate(self, to_format: str, mode: Optional[str] = None) -> str:
+        """Return one target format as a string"""
+        return ''.join(self.iter_chunks(to_format, mode))
+
+    def stream(self, to_format: str, fp, mode: Optional[str] = None) -> None:
+        """Write one target format to a file object as it is generated
+
+        Binary file objects (``open(..., 'wb')``, ``io.BytesIO``,
+        ``sys.stdout.buffer``) get UTF-8 bytes, anything else gets text.
+        """
+        binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase))
+        for chunk in self.iter_chunks(to_format, mode):
+            fp.write(chunk.encode('utf-8') if binary else chunk)
+
+    def write_file(self, to_format: str, output_path: str, mode: Optional[str] = None) -> bool:
+        """Write one target format to a file; returns whether the file changed"""
+        return self._store(output_path, self.iter_chunks(to_format, mode))
+
+    def _check_mode(self, mode: Optional[str]) -> None:
+        """Reject modes the token set does not define"""
+        if mode is not None and mode not in self.modes:
+            raise ValueError(f"Unknown mode: {mode} (available: {', '.join(self.modes)})")
+
+    def _store(self, output_path: str, chunks: Iterable[str]) -> bool:
+        """Stream generated chunks to a file unless it already holds exactly that content
+
+        Chunks go through a buffered temporary file next to the output while
+        their hash is taken, so memory stays flat however many tokens there
+        are. The temporary file replaces the output only when the hash
+        differs; unchanged outputs keep their mtime, so bundlers watching
+        them do not rebuild. Returns whether the file was written.
+        """
+        import hashlib
+        path = Path(output_path)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        digest = hashlib.sha256()
+        size = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    data = chunk.encode('utf-8')
+                    f.write(data)
+                    digest.update(data)
+                    size += len(data)
+
+            if path.is_file() and path.stat().st_size == size:
+                existing = hashlib.sha256()
+                with open(path, 'rb') as f:
+                    for block in iter(lambda: f.read(1 << 16), b''):
+                        existing.update(block)
+                if existing.digest() == digest.digest():
+                    tmp_path.unlink()
+                    return False
+
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return True
+
+    @staticmethod
+    def _report(to_format: str, output_path: str, written: bool) -> None:
+        """Print the outcome of writing one target"""
+        print(f"✓ {'Generated' if written else 'Unchanged'} {TARGET_LABELS[to_format]}: {output_path}")
+
+    def convert(self, to_format: str, output_path: str, mode: Optional[str] = None) -> bool:
+        """Emit one target format; returns whether the output was written"""
+        written = self.write_file(to_format, output_path, mode)
+        self._report(to_format, output_path, written)
+        return written
+
+    def plan(self, targets: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Expand targets and split off those that would overwrite a token file
+
+        Returns the targets to emit and the skipped ones.
+        """
+        inputs = {path.resolve() for path in self.tokens_paths}
+        pending, skipped = [], []
+        for target in self.expand_targets(targets):
+            if Path(target['output']).resolve() in inputs:
+                skipped.append(target)
+            else:
+                pending.append(target)
+        return pending, skipped
+
+    @staticmethod
+    def _report_skipped(target: Dict[str, Any]) -> None:
+        """Print why a target was not emitted"""
+        print(f"⚠ Skipped {target['to']}: output is the input file {target['output']}")
+
+    def expand_targets(self, targets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Check target modes and expand mode "all" into one target per mode
+
+        TypeScript and JSON outputs hold one mode, so ``design-tokens.ts``
+        with mode "all" becomes ``design-tokens.light.ts``,
+        ``design-tokens.dark.ts`` and so on; CSS and Tailwind outputs always
+        cover every mode.
+        """
+        expanded = []
+        for target in targets:
+            mode = target.get('mode')
+            if mode != 'all':
+                self._check_mode(mode)
+            if mode == 'all' and target['to'] in PER_MODE_TARGETS:
+                output = Path(target['output'])
+                expanded.extend(
+                    {**target, 'mode': name,
+                     'output': str(output.with_name(f"{output.stem}.{name}{output.suffix}"))}
+                    for name in self.modes
+                )
+            elif mode == 'all':
+                expanded.append({**target, 'mode': None})
+            else:
+                expanded.append(target)
+        return expanded
 
-        ts_code = '''// Auto-generated design tokens for ACP
+    def build(self, targets: List[Dict[str, Any]], jobs: int = 1) -> Dict[str, int]:
+        """Emit several targets from the one parsed token set
+
+        Each target has ``to``, ``output`` and optionally ``mode`` (a mode
+        name, or "all"; see ``expand_targets``). Outputs that would
+        overwrite a token file are skipped. With ``jobs`` > 1 the targets
+        are emitted in a process pool whose workers share this converter's
+        already parsed tokens; ``jobs`` <= 0 uses every CPU. Returns the
+        number of outputs ``written``, ``unchanged`` and ``skipped``.
+        """
+        pending, skipped = self.plan(targets)
+        for target in skipped:
+            self._report_skipped(target)
+        counts = {'written': 0, 'unchanged': 0, 'skipped': len(skipped)}
+
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        jobs = min(jobs, len(pending))
+        if jobs <= 1:
+            for target in pending:
+                written = self.convert(target['to'], target['output'], target.get('mode'))
+                counts['written' if written else 'unchanged'] += 1
+            return counts
+
+        import multiprocessing
+        with multiprocessing.Pool(jobs, initializer=_init_build_worker, initargs=(self,)) as pool:
+            for target, written in zip(pending, pool.imap(_build_target_worker, pending)):
+                self._report(target['to'], target['output'], written)
+                counts['written' if written else 'unchanged'] += 1
+        return counts
+
+    def watch(self, targets: List[Dict[str, Any]], jobs: int = 1,
+              poll_interval: float = 0.1, debounce: float = 0.05) -> None:
+        """Build the targets, then rebuild the affected ones whenever a token file changes
+
+        The token files are polled for (mtime, size) changes; a burst of
+        saves is debounced for ``debounce`` seconds. After a change only the
+        modified files are re-parsed, and only targets generated from the
+        sections that changed are regenerated. Outputs are replaced
+        atomically, so readers never see a half-written file. Errors in the
+        token files are reported and the previous outputs are kept.
+        """
+        def snapshot() -> Dict[Path, Optional[Tuple[int, int]]]:
+            stamps = {}
+            for path in self.tokens_paths:
+                try:
+                    st = path.stat()
+                except OSError:
+                    stamps[path] = None
+                    continue
+                stamps[path] = (st.st_mtime_ns, st.st_size)
+            return stamps
+
+        stamps = snapshot()
+        self.build(targets, jobs)
+        sources = ', '.join(str(path) for path in self.tokens_paths)
+        print(f"Watching {sources}, press Ctrl+C to stop", flush=True)
+
+        try:
+            while True:
+                time.sleep(poll_interval)
+                current = snapshot()
+                if current == stamps:
+                    continue
+                while True:
+                    time.sleep(debounce)
+                    settled = snapshot()
+                    if settled == current:
+                        break
+                    current = settled
+                stamps = current
+
+                started = time.perf_counter()
+                try:
+                    changed = self.reload()
+                    affected = [target for target in self.expand_targets(targets)
+                                if self.target_sections(target) & changed]
+                    self.build(affected)
+                except (OSError, ValueError) as e:
+                    print(f"✗ Error: {e}", file=sys.stderr, flush=True)
+                    continue
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"  rebuilt {len(affected)} target(s) in {elapsed:.0f}ms"
+                      f" (changed: {', '.join(sorted(changed)) or 'nothing'})", flush=True)
+        except KeyboardInterrupt:
+            pass
+
+    def to_typescript(self, output_path: str, mode: Optional[str] = None) -> bool:
+        """Convert tokens to TypeScript format (default: the default mode)"""
+        return self.convert('typescript', output_path, mode)
+
+    def _typescript_chunks(self, mode: str) -> Iterator[str]:
+        """Generate TypeScript content"""
+        yield '''// Auto-generated design tokens for ACP
 // This file is generated from design-tokens.json
 // Do not edit manually - regenerate with design-tokens-converter.py
 
@@ -81,146 +527,142 @@ export const designTokens = {
 '''
 
         # Add colors
-        for category, color_values in colors.items():
-            ts_code += f"    {category}: {{\n"
-            for name, value in color_values.items():
-                ts_code += f"      {name}: '{value}',\n"
-            ts_code += "    },\n"
+        for category, color_values in self.ir['palettes'].get(mode, []):
+            yield f"    {ts_key(category)}: {{\n"
+            for name, value in color_values:
+                yield f"      {ts_key(name)}: {ts_value(value)},\n"
+            yield "    },\n"
 
-        ts_code += '''  },
+        yield '''  },
   spacing: {
 '''
 
         # Add spacing
-        for name, value in spacing.items():
-            ts_code += f"    {name}: '{value}',\n"
+        for name, value in self.ir['spacing']:
+            yield f"    {ts_key(name)}: {ts_value(value)},\n"
 
-        ts_code += '''  },
+        yield '''  },
   typography: {
 '''
 
         # Add typography
-        for category, values in typography.items():
-            ts_code += f"    {category}: {{\n"
-            if isinstance(values, dict):
-                for key, val in values.items():
-                    ts_code += f"      {key}: {repr(val)},\n"
-            ts_code += "    },\n"
-
-        ts_code += '''  },
+        for category, values in self.ir['typography']:
+            if not isinstance(values, list):
+                yield f"    {ts_key(category)}: {ts_value(values)},\n"
+                continue
+            yield f"    {ts_key(category)}: {{\n"
+            for key, val in values:
+                yield f"      {ts_key(key)}: {ts_value(val)},\n"
+            yield "    },\n"
+
+        yield '''  },
   effects: {
 '''
 
         # Add effects
-        for category, effect_values in effects.items():
-            ts_code += f"    {category}: {{\n"
-            for name, value in effect_values.items():
-                ts_code += f"      {name}: '{value}',\n"
-            ts_code += "    },\n"
+        for category, effect_values in self.ir['effects']:
+            yield f"    {ts_key(category)}: {{\n"
+            for name, value in effect_values:
+                yield f"      {ts_key(name)}: {ts_value(value)},\n"
+            yield "    },\n"
 
-        ts_code += '''  },
+        yield '''  },
 } as const;
 
 export type DesignTokens = typeof designTokens;
 '''
 
-        return ts_code
+    def to_css(self, output_path: str) -> bool:
+        """Convert tokens to CSS custom properties covering every mode"""
+        return self.convert('css', output_path)
 
-    def to_css(self, output_path: str) -> None:
-        """Convert tokens to CSS custom properties"""
-        css_content = self._generate_css()
-        Path(output_path).write_text(css_content)
-        print(f"✓ Generated CSS tokens: {output_path}")
+    def _color_variables(self, mode: str) -> List[Tuple[str, str]]:
+        """Return the (custom property, value) pairs of a mode's colors"""
+        return [
+            (f"--color-{category}-{name}".replace('_', '-'), value)
+            for category, color_values in self.ir['colors'].get(mode, [])
+            for name, value in color_values
+        ]
 
-    def _generate_css(self) -> str:
-        """Generate CSS custom properties"""
-        css = '''/* Auto-generated CSS custom properties
+    def _css_chunks(self) -> Iterator[str]:
+        """Generate CSS custom properties
+
+        The default mode fills :root, dark also applies under
+        prefers-color-scheme, and with several modes each one gets a
+        [data-theme="<mode>"] block so one stylesheet serves every theme.
+        """
+        default = self.default_mode
+        yield f'''/* Auto-generated CSS custom properties
  * Generated from design-tokens.json
- * Supports both light and dark modes
+ * Supports light and dark modes, plus data-theme scoped themes
  */
 
-:root {
-  /* Light mode colors (default) */
+:root {{
+  /* {default.capitalize()} mode colors (default) */
 '''
 
-        # Light mode colors
-        light_colors = self.tokens.get('modes', {}).get('light', {}).get('colors', {})
-        for category, color_values in light_colors.items():
-            for name, value in color_values.items():
-                var_name = f"--color-{category}-{name}".replace('_', '-')
-                css += f"  {var_name}: {value};\n"
+        # Color declarations are built once per mode and reused by every block
+        mode_lines = {
+            mode: [f"{var_name}: {value};\n" for var_name, value in self._color_variables(mode)]
+            for mode in self.modes
+        }
+
+        for line in mode_lines.get(default, []):
+            yield '  ' + line
 
         # Spacing
-        css += "\n  /* Spacing scale */\n"
-        spacing = self.tokens.get('spacing', {})
-        for name, value in spacing.items():
+        yield "\n  /* Spacing scale */\n"
+        for name, value in self.ir['spacing']:
             var_name = f"--space-{name}".replace('_', '-')
-            css += f"  {var_name}: {value};\n"
+            yield f"  {var_name}: {value};\n"
 
         # Typography
-        css += "\n  /* Typography */\n"
-        typography = self.tokens.get('typography', {})
-        if 'sizes' in typography:
-            for name, value in typography['sizes'].items():
-                var_name = f"--font-size-{name}".replace('_', '-')
-                css += f"  {var_name}: {value};\n"
+        yield "\n  /* Typography */\n"
+        for category, values in self.ir['typography']:
+            if category == 'sizes' and isinstance(values, list):
+                for name, value in values:
+                    var_name = f"--font-size-{name}".replace('_', '-')
+                    yield f"  {var_name}: {value};\n"
 
         # Effects
-        css += "\n  /* Effects */\n"
-        effects = self.tokens.get('effects', {})
-        if 'shadows' in effects:
-            for name, value in effects['shadows'].items():
-                var_name = f"--shadow-{name}".replace('_', '-')
-                css += f"  {var_name}: {value};\n"
-
-        if 'radii' in effects:
-            for name, value in effects['radii'].items():
-                var_name = f"--radius-{name}".replace('_', '-')
-                css += f"  {var_name}: {value};\n"
-
-        # Dark mode
-        dark_colors = self.tokens.get('modes', {}).get('dark', {}).get('colors', {})
-        css += '''\n}
+        yield "\n  /* Effects */\n"
+        effects = dict(self.ir['effects'])
+        for name, value in effects.get('shadows', []):
+            var_name = f"--shadow-{name}".replace('_', '-')
+            yield f"  {var_name}: {value};\n"
+        for name, value in effects.get('radii', []):
+            var_name = f"--radius-{name}".replace('_', '-')
+            yield f"  {var_name}: {value};\n"
+        yield "\n}\n"
 
+        if 'dark' in mode_lines and default != 'dark':
+            yield '''
 /* Dark mode colors */
 @media (prefers-color-scheme: dark) {
   :root {
 '''
+            for line in mode_lines['dark']:
+                yield '    ' + line
+            yield "  }\n}\n"
 
-        for category, color_values in dark_colors.items():
-            for name, value in color_values.items():
-                var_name = f"--color-{category}-{name}".replace('_', '-')
-                css += f"    {var_name}: {value};\n"
-
-        css += '''  }
-}
-
-/* Alternative: dark class selector */
-.dark {
-'''
+        if len(mode_lines) > 1:
+            yield '\n/* Theme selectors: set data-theme="<mode>" (or the .dark class) on any element */\n'
+            for mode, lines in mode_lines.items():
+                selector = f'[data-theme="{mode}"]'
+                if mode == 'dark':
+                    selector = '.dark,\n' + selector
+                yield f"\n{selector} {{\n"
+                for line in lines:
+                    yield '  ' + line
+                yield "}\n"
 
-        for category, color_values in dark_colors.items():
-            for name, value in color_values.items():
-                var_name = f"--color-{category}-{name}".replace('_', '-')
-                css += f"  {var_name}: {value};\n"
-
-        css += '''}\n'''
-
-        return css
-
-    def to_tailwind(self, output_path: str) -> None:
+    def to_tailwind(self, output_path: str) -> bool:
         """Convert tokens to Tailwind CSS config"""
-        tailwind_content = self._generate_tailwind()
-        Path(output_path).write_text(tailwind_content)
-        print(f"✓ Generated Tailwind config: {output_path}")
+        return self.convert('tailwind', output_path)
 
-    def _generate_tailwind(self) -> str:
+    def _tailwind_chunks(self) -> Iterator[str]:
         """Generate Tailwind config"""
-        light_colors = self.tokens.get('modes', {}).get('light', {}).get('colors', {})
-        dark_colors = self.tokens.get('modes', {}).get('dark', {}).get('colors', {})
-        spacing = self.tokens.get('spacing', {})
-
-        config = '''/** @type {import('tailwindcss').Config} */
+        yield '''/** @type {import('tailwindcss').Config} */
 
 module.exports = {
   theme: {
@@ -229,21 +671,21 @@ module.exports = {
         acp: {
 '''
 
-        # Add light mode colors
-        for category, color_values in light_colors.items():
-            for name, value in color_values.items():
-                config += f"          '{category}-{name}': '{value}',\n"
+        # Add default mode colors
+        for category, color_values in self.ir['colors'].get(self.default_mode, []):
+            for name, value in color_values:
+                yield f"          {ts_key(f'{category}-{name}', quote=True)}: {ts_value(value)},\n"
 
-        config += '''        },
+        yield '''        },
       },
       spacing: {
 '''
 
         # Add spacing
-        for name, value in spacing.items():
-            config += f"        '{name}': '{value}',\n"
+        for name, value in self.ir['spacing']:
+            yield f"        {ts_key(str(name), quote=True)}: {ts_value(value)},\n"
 
-        config += '''      },
+        yield '''      },
     },
   },
   plugins: [],
@@ -254,58 +696,418 @@ module.exports = {
 };
 '''
 
-        return config
+    def to_json(self, output_path: str, mode: Optional[str] = None) -> bool:
+        """Convert/export tokens to JSON format (all modes when ``mode`` is None)"""
+        self._check_mode(mode)
+        written = self._store(output_path, self._json_chunks(mode))
+        self._report('json', output_path, written)
+        return written
 
-    def to_json(self, output_path: str, mode: Optional[str] = None) -> None:
-        """Convert/export tokens to JSON format"""
+    def _json_chunks(self, mode: Optional[str] = None) -> Iterator[str]:
+        """Generate JSON content"""
         # Just copy the source JSON if no mode specified, or extract specific mode
+        tokens = self.tokens
         if mode and mode in self.tokens.get('modes', {}):
-            filtered = {
+            tokens = {
                 'version': self.tokens.get('version', '1.0.0'),
-                'modes': {mode: self.tokens['modes'][mode]},
+                'modes': {mode: self.mode_tokens(mode)},
                 'spacing': self.tokens.get('spacing', {}),
                 'typography': self.tokens.get('typography', {}),
                 'effects': self.tokens.get('effects', {}),
             }
-            output_json = json.dumps(filtered, indent=2)
+        return json.JSONEncoder(indent=2).iterencode(tokens)
+
+    def diff(self, newer: 'DesignTokensConverter') -> Dict[str, Dict[str, Any]]:
+        """Compare this token set with a newer one, token by token
+
+        Both resolved flat tables are keyed by dotted path, so the diff is a
+        pass of key lookups. Returns ``added`` and ``removed`` as
+        {path: value} and ``changed`` as {path: (old, new)}.
+        """
+        old, new = self.table, newer.table
+        return {
+            'added': {key: value for key, value in new.items() if key not in old},
+            'removed': {key: value for key, value in old.items() if key not in new},
+            'changed': {key: (old[key], value) for key, value in new.items()
+                        if key in old and old[key] != value},
+        }
+
+    def _css_property(self, key: str) -> Optional[Tuple[Optional[str], str]]:
+        """(mode or None for :root, custom property) a token appears as in CSS output"""
+        parts = key.split('.')
+        if len(parts) == 5 and parts[0] == 'modes' and parts[2] == 'colors':
+            return parts[1], f"--color-{parts[3]}-{parts[4]}".replace('_', '-')
+        for prefix, var_prefix in CSS_PROPERTIES.items():
+            if key.startswith(prefix) and key.count('.') == prefix.count('.'):
+                return None, f"{var_prefix}{key[len(prefix):]}".replace('_', '-')
+        return None
+
+    def iter_css_patch(self, changes: Dict[str, Dict[str, Any]]) -> Iterator[str]:
+        """Generate CSS overriding only the added and changed custom properties
+
+        The patch repeats the selectors of the full stylesheet (:root,
+        prefers-color-scheme, [data-theme]) for just the properties that
+        differ, so it is meant to load after the previous design-tokens.css.
+        Removed tokens cannot be expressed as overrides and are only listed.
+        """
+        scopes: Dict[Optional[str], List[str]] = {}
+        for key in list(changes['added']) + list(changes['changed']):
+            target = self._css_property(key)
+            if target is not None:
+                scope, var_name = target
+                scopes.setdefault(scope, []).append(f"{var_name}: {self.table[key]};\n")
+
+        yield '''/* Auto-generated design token changes
+ * Only custom properties added or changed since the previous token set;
+ * load after design-tokens.css
+ */
+'''
+        removed = [target[1] for target in map(self._css_property, changes['removed']) if target]
+        if removed:
+            yield f"/* Removed: {', '.join(dict.fromkeys(removed))} */\n"
+
+        default = self.default_mode
+        root_lines = scopes.get(None, []) + scopes.get(default, [])
+        if root_lines:
+            yield "\n:root {\n"
+            for line in root_lines:
+                yield '  ' + line
+            yield "}\n"
+
+        if scopes.get('dark') and default != 'dark':
+            yield "\n@media (prefers-color-scheme: dark) {\n  :root {\n"
+            for line in scopes['dark']:
+                yield '    ' + line
+            yield "  }\n}\n"
+
+        if len(self.modes) > 1:
+            for mode in self.modes:
+                if not scopes.get(mode):
+                    continue
+                selector = f'[data-theme="{mode}"]'
+                if mode == 'dark':
+                    selector = '.dark,\n' + selector
+                yield f"\n{selector} {{\n"
+                for line in scopes[mode]:
+                    yield '  ' + line
+                yield "}\n"
+
+    def iter_typescript_patch(self, changes: Dict[str, Dict[str, Any]],
+                              mode: Optional[str] = None) -> Iterator[str]:
+        """Generate a TypeScript module with the added and changed values of one mode
+
+        ``designTokenChanges`` has the shape of ``designTokens`` but holds
+        only what differs, ready to deep-merge over the previous tokens.
+        """
+        self._check_mode(mode)
+        mode = mode or self.default_mode
+        mode_prefix = f"modes.{mode}."
+        default_prefix = f"modes.{self.default_mode}."
+        tree: Dict[str, Any] = {}
+        for key in list(changes['added']) + list(changes['changed']):
+            if key.startswith(mode_prefix):
+                path = key[len(mode_prefix):].split('.')
+            elif key.startswith(default_prefix) and mode_prefix + key[len(default_prefix):] not in self.table:
+                # Inherited from the default mode, see mode_tokens
+                path = key[len(default_prefix):].split('.')
+            elif key.split('.', 1)[0] in ('spacing', 'typography', 'effects'):
+                path = key.split('.')
+            else:
+                continue
+            node = tree
+            for part in path[:-1]:
+                node = node.setdefault(part, {})
+            node[path[-1]] = self.table[key]
+
+        yield f'''// Auto-generated design token changes ({mode} mode)
+// Only values added or changed since the previous token set;
+// deep-merge over designTokens from design-tokens.ts
+
+export const designTokenChanges = {{
+'''
+        yield from self._typescript_object(tree, 1)
+        yield '''} as const;
+'''
+
+    def _typescript_object(self, tree: Dict[str, Any], depth: int) -> Iterator[str]:
+        """Generate the members of a nested TypeScript object literal"""
+        indent = '  ' * depth
+        for key, value in tree.items():
+            if isinstance(value, dict):
+                yield f"{indent}{ts_key(key)}: {{\n"
+                yield from self._typescript_object(value, depth + 1)
+                yield f"{indent}}},\n"
+            else:
+                yield f"{indent}{ts_key(key)}: {ts_value(value)},\n"
+
+
+# Converter shared by the worker processes of parallel builds
+_worker_converter = None
+
+
+def _init_build_worker(converter: DesignTokensConverter) -> None:
+    """Install the parent's parsed converter in a build worker"""
+    global _worker_converter
+    _worker_converter = converter
+
+
+def _build_target_worker(target: Dict[str, Any]) -> bool:
+    """Emit one target in a worker, returning whether it was written"""
+    return _worker_converter.write_file(target['to'], target['output'], target.get('mode'))
+
+
+def _parse_build(build: Dict[str, Any], base: Path, source: str) -> Dict[str, Any]:
+    """Turn one manifest build entry into ``input`` paths and ``targets``"""
+    default_mode = build.get('mode')
+    targets = []
+    for target in build.get('targets', []):
+        to_format = target.get('to')
+        if to_format not in TARGET_FILES:
+            raise ValueError(f"Unknown target format in {source}: {to_format}")
+        targets.append({
+            'to': to_format,
+            'output': str(base / target.get('output', TARGET_FILES[to_format])),
+            'mode': target.get('mode', default_mode),
+        })
+
+    inputs = build.get('input', [])
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    return {
+        'input': [str(base / p) for p in inputs] or None,
+        'targets': targets,
+    }
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Any]:
+    """Read a build manifest, resolving its paths against the manifest's directory
+
+    A manifest is a JSON object with an optional ``input`` token file (or
+    list of files to layer), an optional default ``mode`` and a list of
+    ``targets``, each with ``to`` and optionally ``output`` (default: the
+    TARGET_FILES name) and ``mode``:
+
+        {"input": ["design-tokens.json", "brands/acme.json"],
+         "targets": [{"to": "css", "output": "src/styles/design-tokens.css"},
+                     {"to": "typescript", "mode": "all", "output": "src/tokens.ts"}]}
+    """
+    path = Path(manifest_path)
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    return _parse_build(manifest, path.parent, manifest_path)
+
+
+def load_batch(manifest_path: str) -> List[Dict[str, Any]]:
+    """Read a batch manifest: a ``builds`` list of build manifests
+
+    Each build has the shape ``load_manifest`` reads and must name its
+    ``input``; a plain build manifest is read as a batch of one.
+    """
+    path = Path(manifest_path)
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+
+    builds = [_parse_build(build, path.parent, manifest_path)
+              for build in manifest.get('builds', [manifest])]
+    for number, build in enumerate(builds, 1):
+        if not build['input']:
+            raise ValueError(f"Build {number} in {manifest_path} has no input")
+    return builds
+
+
+def run_batch(builds: List[Dict[str, Any]], threads: int = 1) -> Dict[str, int]:
+    """Emit every target of several builds in this process
+
+    Builds layering the same token files share one parsed converter. With
+    ``threads`` > 1 the outputs are generated and written from a thread
+    pool, which helps when writes dominate (network or slow disks);
+    progress is still printed in manifest order. Returns the number of
+    outputs ``written``, ``unchanged`` and ``skipped``.
+    """
+    converters: Dict[Tuple[str, ...], DesignTokensConverter] = {}
+    counts = {'written': 0, 'unchanged': 0, 'skipped': 0}
+    jobs = []
+    for build in builds:
+        key = tuple(build['input'])
+        converter = converters.get(key)
+        if converter is None:
+            converter = converters[key] = DesignTokensConverter(list(key))
+        pending, skipped = converter.plan(build['targets'])
+        for target in skipped:
+            converter._report_skipped(target)
+        counts['skipped'] += len(skipped)
+        jobs.extend((converter, target) for target in pending)
+
+    def emit(job: Tuple[DesignTokensConverter, Dict[str, Any]]) -> bool:
+        converter, target = job
+        return converter.write_file(target['to'], target['output'], target.get('mode'))
+
+    if threads > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(threads) as pool:
+            results = list(pool.map(emit, jobs))
+    else:
+        results = map(emit, jobs)
+
+    for (converter, target), written in zip(jobs, results):
+        converter._report(target['to'], target['output'], written)
+        counts['written' if written else 'unchanged'] += 1
+    return counts
+
+
+def _batch_main(argv: List[str]) -> int:
+    """Build every token set listed in a batch manifest"""
+    parser = argparse.ArgumentParser(
+        prog='design-tokens-converter.py batch',
+        description='Build many token sets and targets from one manifest in one process'
+    )
+
+    parser.add_argument('manifest',
+                        help='Batch manifest (JSON) with a "builds" list of build manifests')
+    parser.add_argument('--threads', type=int, default=1,
+                        help='Threads generating and writing outputs (default: 1)')
+    parser.add_argument('--no-venv-reexec', action='store_true',
+                        help='Run in the current interpreter instead of the project .venv')
+
+    args = parser.parse_args(argv)
+
+    try:
+        builds = load_batch(args.manifest)
+        counts = run_batch(builds, args.threads)
+        print(f"✓ Built {len(builds)} token set(s), {sum(counts.values())} target(s): "
+              f"{counts['written']} written, {counts['unchanged']} unchanged, "
+              f"{counts['skipped']} skipped")
+        return 0
+    except Exception as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _diff_main(argv: List[str]) -> int:
+    """Report the token changes between two token sets, optionally writing patches"""
+    parser = argparse.ArgumentParser(
+        prog='design-tokens-converter.py diff',
+        description='Compare two versions of a token set and emit minimal override patches'
+    )
+
+    parser.add_argument('old', help='Previous token file')
+    parser.add_argument('new', help='New token file')
+    parser.add_argument('--format', choices=['text', 'json'], default='text',
+                        help='Print the changes as text or JSON (default: text)')
+    parser.add_argument('--css-patch',
+                        help='Write CSS overriding only the added and changed custom properties')
+    parser.add_argument('--ts-patch',
+                        help='Write a TypeScript module with only the added and changed values')
+    parser.add_argument('--mode',
+                        help='Mode of the TypeScript patch (default: light, or the first mode)')
+    parser.add_argument('--no-venv-reexec', action='store_true',
+                        help='Run in the current interpreter instead of the project .venv')
+
+    args = parser.parse_args(argv)
+
+    try:
+        old = DesignTokensConverter(args.old)
+        new = DesignTokensConverter(args.new)
+        changes = old.diff(new)
+
+        if args.format == 'json':
+            print(json.dumps({
+                'added': changes['added'],
+                'removed': changes['removed'],
+                'changed': {key: {'old': before, 'new': after}
+                            for key, (before, after) in changes['changed'].items()},
+            }, indent=2))
         else:
-            output_json = json.dumps(self.tokens, indent=2)
+            for key, value in changes['added'].items():
+                print(f"+ {key}: {value}")
+            for key, value in changes['removed'].items():
+                print(f"- {key}: {value}")
+            for key, (before, after) in changes['changed'].items():
+                print(f"~ {key}: {before} -> {after}")
 
-        Path(output_path).write_text(output_json)
-        print(f"✓ Generated JSON tokens: {output_path}")
+        # Status goes to stderr so --format json output stays parseable
+        if args.css_patch:
+            written = new._store(args.css_patch, new.iter_css_patch(changes))
+            print(f"✓ {'Generated' if written else 'Unchanged'} CSS patch: {args.css_patch}",
+                  file=sys.stderr)
+        if args.ts_patch:
+            written = new._store(args.ts_patch, new.iter_typescript_patch(changes, args.mode))
+            print(f"✓ {'Generated' if written else 'Unchanged'} TypeScript patch: {args.ts_patch}",
+                  file=sys.stderr)
+        print(f"✓ {len(changes['added'])} added, {len(changes['removed'])} removed, "
+              f"{len(changes['changed'])} changed", file=sys.stderr)
+        return 0
+    except Exception as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        return 1
 
 
 def main():
+    argv = sys.argv[1:]
+    if argv and argv[0] == 'batch':
+        return _batch_main(argv[1:])
+    if argv and argv[0] == 'diff':
+        return _diff_main(argv[1:])
+
     parser = argparse.ArgumentParser(
-        description='Convert ACP design tokens between formats'
+        description='Convert ACP design tokens between formats',
+        epilog='Other commands: `batch` builds every token set of a manifest in one '
+               'process, `diff` compares two token sets and writes minimal patches. '
+               'Run them with --help for options.'
     )
 
     parser.add_argument('--from', dest='from_format', default='json',
                         help='Source format (default: json)')
-    parser.add_argument('--to', dest='to_format', required=True,
-                        choices=['typescript', 'css', 'tailwind', 'json'],
-                        help='Target format')
-    parser.add_argument('--mode', choices=['light', 'dark'], default='light',
-                        help='Color mode for generation (default: light)')
-    parser.add_argument('--input', required=True,
-                        help='Input file path')
-    parser.add_argument('--output', required=True,
-                        help='Output file path')
-
-    args = parser.parse_args()
+    parser.add_argument('--to', dest='to_format',
+                        choices=list(TARGET_FILES) + ['all'],
+                        help='Target format; all writes every format into the --output directory')
+    parser.add_argument('--mode',
+                        help='Color mode/theme for TypeScript and JSON output (default: light, '
+                             'or the first mode); all writes one output per mode')
+    parser.add_argument('--input', nargs='+',
+                        help='Input token file(s); later files override earlier ones')
+    parser.add_argument('--output',
+                        help='Output file path, or directory with --to all')
+    parser.add_argument('--manifest',
+                        help='Build manifest (JSON) listing the targets to emit in one run')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and regenerate outputs as the token files change')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes for multi-target builds (0 = all CPUs, default: 1)')
+    parser.add_argument('--no-venv-reexec', action='store_true',
+                        help='Run in the current interpreter instead of the project .venv')
+
+    args = parser.parse_args(argv)
+    if not args.manifest and not (args.to_format and args.input and args.output):
+        parser.error('--to, --input and --output are required without --manifest')
 
     try:
-        converter = DesignTokensConverter(args.input)
+        if args.manifest:
+            manifest = load_manifest(args.manifest)
+            input_path = args.input or manifest['input']
+            if not input_path:
+                raise ValueError(f"No input: pass --input or set it in {args.manifest}")
+            targets = manifest['targets']
+        elif args.to_format == 'all':
+            input_path = args.input
+            Path(args.output).mkdir(parents=True, exist_ok=True)
+            targets = [
+                {'to': to_format, 'output': str(Path(args.output) / file_name), 'mode': args.mode}
+                for to_format, file_name in TARGET_FILES.items()
+            ]
+        else:
+            input_path = args.input
+            targets = [{'to': args.to_format, 'output': args.output, 'mode': args.mode}]
 
-        if args.to_format == 'typescript':
-            converter.to_typescript(args.output, args.mode)
-        elif args.to_format == 'css':
-            converter.to_css(args.output)
-        elif args.to_format == 'tailwind':
-            converter.to_tailwind(args.output)
-        elif args.to_format == 'json':
-            converter.to_json(args.output, args.mode)
+        converter = DesignTokensConverter(input_path)
+        if args.watch:
+            converter.watch(targets, args.jobs)
+            return 0
 
+        counts = converter.build(targets, args.jobs)
+        if args.manifest or args.to_format == 'all' or args.mode == 'all':
+            print(f"✓ Built {sum(counts.values())} target(s): {counts['written']} written, "
+                  f"{counts['unchanged']} unchanged, {counts['skipped']} skipped")
         return 0
 
     except Exception as e:
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+ACP Design Validator Benchmark
+
+Benchmarks for the design validator:
+- Scanner: times DesignValidator.audit_file over a reproducible synthetic
+  source file and reports lines/second
+- Startup: times `design-validator.py --help` as a fresh process, with and
+  without the project .venv re-exec
+- Corpus: generates a reproducible synthetic React/CSS tree (file count,
+  sizes, violation density, minified files, deep node_modules) and runs the
+  validator CLI over it in each mode, reporting files/sec, lines/sec and
+  peak RSS
+
+Results can be saved as a JSON baseline and compared against a later run:
+
+    python design-validator-benchmark.py --save baseline.json
+    python design-validator-benchmark.py --compare baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import statistics
+import subprocess
+import random
+import tempfile
+import importlib.util
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Line shapes mixed into the synthetic file, roughly matching a React/CSS codebase
+LINE_TEMPLATES = [
+    "import {{ Button }} from './components/Button{n}';",
+    "// TODO: refactor component {n}",
+    "const Card{n} = () => <div className=\"card\">{{title}}</div>;",
+    "  color: #{hex};",
+    "  background-color: var(--color-primary-bg);",
+    "  padding: {px}px {px2}px;",
+    "  margin: 0 auto;",
+    "  width: 100%;",
+    "  border-radius: {radius}px;",
+    "  style={{{{ borderRadius: 8, gap: '{px}px' }}}}",
+    "  font-size: 14px;",
+    "  return items.map((item) => item.id === selectedId);",
+    "}}",
+    "",
+]
+
+# Corpus lines per language; each line is drawn from the violating list
+# with probability --violation-density and from the clean list otherwise
+CORPUS_TEMPLATES = {
+    'tsx': {
+        'clean': [
+            "import {{ Button }} from './components/Button{n}';",
+            "// Renders item {n}",
+            "const item{n} = items[{n}];",
+            "  <div className=\"p-4 rounded-lg\" style={{{{ padding: 16, gap: 8 }}}}>",
+            "  <Card title=\"Card {n}\" href=\"#section-{n}\" />",
+            "  style={{{{ color: designTokens.colors.primary[500], borderRadius: 8 }}}}",
+            "  return items.map((item) => item.id === selectedId);",
+            "}}",
+            "",
+        ],
+        'violating': [
+            "  style={{{{ color: '#{hex}', padding: {px} }}}}",
+            "  <div style={{{{ borderRadius: {radius}, marginTop: '{px}px' }}}}>",
+            "  fontSize: {font},",
+            "  boxShadow: '0 {px}px {px2}px rgba(0, 0, 0, 0.3)',",
+            "  zIndex: {z},",
+        ],
+    },
+    'css': {
+        'clean': [
+            ".card-{n} {{",
+            "  color: var(--color-text-primary);",
+            "  padding: 16px 24px;",
+            "  margin: 0 auto;",
+            "  border-radius: 8px;",
+            "  font-size: 14px;",
+            "/* section {n} */",
+            "}}",
+            "",
+        ],
+        'violating': [
+            "  color: #{hex};",
+            "  padding: {px}px {px2}px;",
+            "  border-radius: {radius}px;",
+            "  font-size: {font}px;",
+            "  box-shadow: 0 {px}px {px2}px rgba(0, 0, 0, 0.3);",
+            "  z-index: {z};",
+        ],
+    },
+}
+CORPUS_TEMPLATES['scss'] = {
+    'clean': CORPUS_TEMPLATES['css']['clean'] + ["$gap-{n}: 8px;", "  &:hover {{ opacity: 0.9; }}"],
+    'violating': CORPUS_TEMPLATES['css']['violating'] + ["$accent-{n}: #{hex};"],
+}
+
+# Share of corpus files per extension
+CORPUS_MIX = [('.tsx', 'tsx', 0.5), ('.ts', 'tsx', 0.1), ('.css', 'css', 0.25), ('.scss', 'scss', 0.15)]
+
+# Validator runs over the corpus: name -> extra CLI arguments
+CORPUS_MODES = {
+    'serial': [],
+    'parallel': ['--jobs', '0'],
+    'json': ['--format', 'json'],
+    'sarif': ['--format', 'sarif'],
+    'cache-cold': ['--cache', '{cache}'],
+    'cache-warm': ['--cache', '{cache}'],
+}
+
+# Metrics where lower is better; everything else is a rate
+LOWER_IS_BETTER = ('peak_rss_mb', '_ms')
+
+
+def load_validator_class():
+    """Import DesignValidator from design-validator.py"""
+    spec = importlib.util.spec_from_file_location(
+        'design_validator', SCRIPTS_DIR / 'design-validator.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.DesignValidator
+
+
+def generate_source(line_count: int, seed: int = 0) -> str:
+    """Generate a reproducible synthetic source file"""
+    rng = random.Random(seed)
+    lines = []
+    for n in range(line_count):
+        template = rng.choice(LINE_TEMPLATES)
+        lines.append(template.format(
+            n=n,
+            hex=f"{rng.randrange(0x1000000):06x}",
+            px=rng.choice([4, 8, 10, 13, 16, 24, 30]),
+            px2=rng.choice([8, 12, 15, 32]),
+            radius=rng.choice([2, 4, 6, 8, 16]),
+        ))
+    return '\n'.join(lines) + '\n'
+
+
+def _corpus_line(rng: random.Random, templates: Dict[str, List[str]], density: float, n: int) -> str:
+    """Draw one corpus line"""
+    pool = templates['violating'] if rng.random() < density else templates['clean']
+    return rng.choice(pool).format(
+        n=n,
+        hex=f"{rng.randrange(0x1000000):06x}",
+        px=rng.choice([5, 10, 13, 18, 30]),
+        px2=rng.choice([7, 15, 22]),
+        radius=rng.choice([2, 5, 6, 10]),
+        font=rng.choice([11, 13, 15, 17]),
+        z=rng.choice([5, 99, 999, 9999]),
+    )
+
+
+def generate_corpus(root: Path, files: int = 500, lines: int = 200, density: float = 0.1,
+                    minified: int = 5, node_modules_depth: int = 6, seed: int = 0) -> Dict:
+    """Write a reproducible synthetic React/CSS tree under ``root``
+
+    File sizes vary around ``lines``; ``minified`` files hold one very long
+    line each. A node_modules tree ``node_modules_depth`` packages deep is
+    added too; the validator should prune it without reading it. Returns
+    the counts of files and lines the validator is expected to audit.
+    """
+    rng = random.Random(seed)
+    stats = {'files': 0, 'lines': 0, 'bytes': 0}
+
+    def write(path: Path, text: str, audited: bool = True):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        if audited:
+            stats['files'] += 1
+            stats['lines'] += text.count('\n')
+            stats['bytes'] += len(text)
+
+    weights = [weight for _, _, weight in CORPUS_MIX]
+    for n in range(files):
+        ext, language, _ = rng.choices(CORPUS_MIX, weights)[0]
+        templates = CORPUS_TEMPLATES[language]
+        count = max(1, int(rng.gauss(lines, lines / 3)))
+        text = '\n'.join(_corpus_line(rng, templates, density, i) for i in range(count)) + '\n'
+        folder = rng.choice(['components', 'pages', 'features/dashboard', 'features/settings/forms',
+                             'styles', 'hooks'])
+        write(root / 'src' / folder / f"Module{n}{ext}", text)
+
+    for n in range(minified):
+        # Bundled output: declarations packed onto one line
+        ext, language = rng.choice([('.js', 'tsx'), ('.css', 'css')])
+        templates = CORPUS_TEMPLATES[language]
+        separator = ',' if language == 'tsx' else ';'
+        body = separator.join(_corpus_line(rng, templates, density, i).strip().rstrip(';,')
+                              for i in range(lines * 20))
+        write(root / 'public' / 'assets' / f"bundle{n}.min{ext}", body + '\n')
+
+    # node_modules/pkg0/node_modules/pkg1/...; never audited
+    package = root
+    for depth in range(node_modules_depth):
+        package = package / 'node_modules' / f"pkg{depth}"
+        for n in range(5):
+            text = '\n'.join(_corpus_line(rng, CORPUS_TEMPLATES['tsx'], density, i)
+                             for i in range(lines)) + '\n'
+            write(package / 'dist' / f"index{n}.js", text, audited=False)
+
+    return stats
+
+
+def run_validator(args: List[str]) -> Dict:
+    """Run the validator CLI once; return wall seconds and its peak RSS in MB
+
+    Peak RSS is that of the main process; --jobs workers are not included.
+    """
+    cmd = [sys.executable, str(SCRIPTS_DIR / 'design-validator.py'), '--no-venv-reexec'] + args
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    stderr = proc.stderr.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    seconds = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    proc.stderr.close()
+
+    # Exit code 1 also means issues were found
+    if proc.returncode not in (0, 1) or b'Error:' in stderr:
+        raise RuntimeError(f"{' '.join(args)} failed: {stderr.decode(errors='replace').strip()}")
+
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return {'seconds': seconds, 'peak_rss_mb': usage.ru_maxrss / scale}
+
+
+def bench_corpus(root: Path, stats: Dict, modes: List[str], repeat: int) -> Dict[str, Dict]:
+    """Run the validator over a corpus in each mode; keep the fastest run"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = Path(tmp) / 'cache'
+        for mode in modes:
+            results[mode] = _bench_mode(root, stats, mode, cache, repeat)
+    return results
+
+
+def _bench_mode(root: Path, stats: Dict, mode: str, cache: Path, repeat: int) -> Dict:
+    """Run the validator over a corpus in one mode"""
+    extra = [arg.format(cache=cache) for arg in CORPUS_MODES[mode]]
+    # A cold cache only stays cold for one run
+    runs = 1 if mode == 'cache-cold' else repeat
+    if mode == 'cache-warm' and not cache.exists():
+        run_validator(['--path', str(root)] + extra)
+    best = None
+    for _ in range(runs):
+        if mode == 'cache-cold' and cache.exists():
+            cache.unlink()
+        run = run_validator(['--path', str(root)] + extra)
+        if best is None or run['seconds'] < best['seconds']:
+            best = run
+    return {
+        'files_per_sec': round(stats['files'] / best['seconds'], 1),
+        'lines_per_sec': round(stats['lines'] / best['seconds'], 1),
+        'peak_rss_mb': round(best['peak_rss_mb'], 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Return the current commit of the repository, if any"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _flatten(results: Dict, prefix: str = '') -> Dict[str, float]:
+    """Flatten nested result metrics to dotted keys"""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[prefix + key] = value
+    return flat
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Print each metric against the baseline; return the regressed ones
+
+    A metric regresses when it is more than ``threshold`` percent worse.
+    """
+    old, new = _flatten(baseline['results']), _flatten(current['results'])
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline.get('date', '?')}):")
+    for key in sorted(old.keys() & new.keys()):
+        if not old[key]:
+            continue
+        change = (new[key] - old[key]) / old[key] * 100
+        worse = change if key.endswith(LOWER_IS_BETTER) else -change
+        mark = ''
+        if worse > threshold:
+            mark = '  ✗ regression'
+            regressions.append(key)
+        print(f"  {key}: {old[key]:,.1f} → {new[key]:,.1f} ({change:+.1f}%){mark}")
+    return regressions
+
+
+def bench_scan(line_count: int, repeat: int) -> float:
+    """Return the best lines/second of audit_file over a synthetic file"""
+    validator = load_validator_class()()
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = Path(tmp) / 'bench.tsx'
+        file_path.write_text(generate_source(line_count))
+
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            validator.audit_file(str(file_path))
+            best = min(best, time.perf_counter() - start)
+
+    return line_count / best
+
+
+def bench_startup(runs: int, reexec: bool) -> float:
+    """Return the median wall time in ms of starting the validator"""
+    cmd = [sys.executable, str(SCRIPTS_DIR / 'design-validator.py'), '--help']
+    env = dict(os.environ)
+    env.pop('ACP_PROJECT_VENV', None)
+    if reexec:
+        env.pop('ACP_NO_VENV_REEXEC', None)
+    else:
+        env['ACP_NO_VENV_REEXEC'] = '1'
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the ACP design validator'
+    )
+
+    parser.add_argument('--lines', type=int, default=200000,
+                        help='Lines in the synthetic file (default: 200000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Timed runs, best one is reported (default: 5)')
+    parser.add_argument('--startup-runs', type=int, default=20,
+                        help='Process starts timed per startup case (default: 20)')
+
+    corpus = parser.add_argument_group('corpus')
+    corpus.add_argument('--files', type=int, default=500,
+                        help='Source files in the synthetic tree (default: 500)')
+    corpus.add_argument('--file-lines', type=int, default=200,
+                        help='Average lines per source file (default: 200)')
+    corpus.add_argument('--violation-density', type=float, default=0.1,
+                        help='Share of lines with a violation (default: 0.1)')
+    corpus.add_argument('--minified', type=int, default=5,
+                        help='Single-line bundle files in the tree (default: 5)')
+    corpus.add_argument('--node-modules-depth', type=int, default=6,
+                        help='Nesting depth of the node_modules tree (default: 6)')
+    corpus.add_argument('--seed', type=int, default=0,
+                        help='Random seed of the tree (default: 0)')
+    corpus.add_argument('--modes', nargs='+', choices=list(CORPUS_MODES), default=list(CORPUS_MODES),
+                        help='Validator runs over the tree (default: all)')
+    corpus.add_argument('--corpus-dir',
+                        help='Generate the tree here and keep it (default: a temporary directory)')
+    corpus.add_argument('--generate-only', action='store_true',
+                        help='Only generate the tree into --corpus-dir')
+
+    parser.add_argument('--skip', nargs='+', choices=['scan', 'startup', 'corpus'], default=[],
+                        help='Benchmarks to leave out')
+    parser.add_argument('--save', metavar='FILE', help='Write the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='Compare the results with a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent a metric may worsen before --compare fails (default: 10)')
+
+    args = parser.parse_args()
+
+    corpus_options = {
+        'files': args.files,
+        'lines': args.file_lines,
+        'density': args.violation_density,
+        'minified': args.minified,
+        'node_modules_depth': args.node_modules_depth,
+        'seed': args.seed,
+    }
+
+    if args.generate_only:
+        if not args.corpus_dir:
+            parser.error('--generate-only needs --corpus-dir')
+        stats = generate_corpus(Path(args.corpus_dir), **corpus_options)
+        print(f"✓ Generated {stats['files']} files, {stats['lines']:,} lines in {args.corpus_dir}")
+        return 0
+
+    results = {}
+    if 'scan' not in args.skip:
+        lines_per_sec = bench_scan(args.lines, args.repeat)
+        results['scan'] = {'lines_per_sec': round(lines_per_sec, 1)}
+        print(f"scan: {lines_per_sec:,.0f} lines/sec ({args.lines} lines, best of {args.repeat})")
+
+    if 'startup' not in args.skip:
+        results['startup'] = {}
+        for reexec in (True, False):
+            label = 'startup' if reexec else 'startup (no venv re-exec)'
+            median_ms = bench_startup(args.startup_runs, reexec)
+            results['startup']['reexec_ms' if reexec else 'no_reexec_ms'] = round(median_ms, 1)
+            print(f"{label}: {median_ms:.0f} ms median ({args.startup_runs} runs)")
+
+    if 'corpus' not in args.skip:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(args.corpus_dir or Path(tmp) / 'corpus')
+            stats = generate_corpus(root, **corpus_options)
+            print(f"corpus: {stats['files']} files, {stats['lines']:,} lines")
+            results['corpus'] = bench_corpus(root, stats, args.modes, args.repeat)
+        for mode, metrics in results['corpus'].items():
+            print(f"  {mode}: {metrics['files_per_sec']:,.0f} files/sec, "
+                  f"{metrics['lines_per_sec']:,.0f} lines/sec, "
+                  f"{metrics['peak_rss_mb']:.0f} MB peak RSS")
+
+    current = {
+        'commit': _git_commit(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'options': {'lines': args.lines, 'repeat': args.repeat, 'corpus': corpus_options},
+        'results': results,
+    }
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(current, indent=2) + '\n')
+        print(f"✓ Baseline saved to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if baseline.get('options') != current['options']:
+            print("⚠ Baseline was recorded with different options", file=sys.stderr)
+        if compare_results(baseline, current, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,168 +14,2004 @@ Helps maintain consistency across the codebase.
 import os
 import sys
 import re
+import stat
+import time
+import errno
+import select
+import struct
 import json
+import math
+import mmap
+import hashlib
+import bisect
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Iterator, Set, FrozenSet, Callable
 import argparse
 
 
 def _activate_project_venv():
-    """Auto-detect project .venv and switch to it"""
-    here = Path(__file__).resolve()
-    parents = list(here.parent.parent.parents)
-    for p in parents:
-        vpy = p / '.venv' / 'bin' / 'python3'
-        if vpy.exists():
-            if sys.executable != str(vpy):
-                os.execv(str(vpy), [str(vpy)] + sys.argv)
-            break
+    """Auto-detect project .venv and switch to it
+
+    The re-exec is skipped when the running interpreter already belongs to
+    that venv, or when ACP_NO_VENV_REEXEC is set or --no-venv-reexec is
+    passed. The flag is exported as ACP_NO_VENV_REEXEC so worker processes
+    inherit it. The venv found (empty if none) is exported as
+    ACP_PROJECT_VENV; hooks can set it themselves to skip the parent
+    directory search.
+    """
+    if '--no-venv-reexec' in sys.argv:
+        os.environ['ACP_NO_VENV_REEXEC'] = '1'
+    if os.environ.get('ACP_NO_VENV_REEXEC'):
+        return
+
+    venv = os.environ.get('ACP_PROJECT_VENV')
+    if venv is None:
+        venv = ''
+        here = Path(__file__).resolve()
+        for p in here.parent.parent.parents:
+            if (p / '.venv' / 'bin' / 'python3').exists():
+                venv = str(p / '.venv')
+                break
+        os.environ['ACP_PROJECT_VENV'] = venv
+
+    if venv and os.path.realpath(sys.prefix) != os.path.realpath(venv):
+        vpy = os.path.join(venv, 'bin', 'python3')
+        os.execv(vpy, [vpy] + sys.argv)
 
 
 _activate_project_venv()
 
+# design_tokens_schema.py sits next to this script, however the script is loaded
+_SCRIPTS_DIR = str(Path(__file__).resolve().parent)
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+
+# Token files are validated and normalized the same way the converter reads them
+from design_tokens_schema import default_mode, load_tokens, normalize_color  # noqa: E402
+
+
+# Token file shipped with this skill, used for fix suggestions when --tokens is not given
+DEFAULT_TOKENS_PATH = Path(__file__).resolve().parent.parent / 'tokens' / 'design-tokens.json'
+
+
+def hex_to_lab(color: str) -> Tuple[float, float, float]:
+    """Convert #rrggbb to CIE L*a*b* (D65), where Euclidean distance is ΔE76"""
+    def linear(channel: int) -> float:
+        c = channel / 255
+        return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+    r, g, b = (linear(int(color[i:i + 2], 16)) for i in (1, 3, 5))
+    x = (0.4124 * r + 0.3576 * g + 0.1805 * b) / 0.95047
+    y = 0.2126 * r + 0.7152 * g + 0.0722 * b
+    z = (0.0193 * r + 0.1192 * g + 0.9505 * b) / 1.08883
+
+    def f(t: float) -> float:
+        return t ** (1 / 3) if t > 0.008856 else 7.787 * t + 16 / 116
+
+    fx, fy, fz = f(x), f(y), f(z)
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def css_length_to_px(value) -> Optional[float]:
+    """Convert a px/rem/em length (or bare number) to pixels at a 16px root"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.match(r'^\s*(-?[\d.]+)\s*(px|rem|em)?\s*$', str(value))
+    if not match:
+        return None
+    number = float(match.group(1))
+    return number * 16 if match.group(2) in ('rem', 'em') else number
+
+
+class TokenIndex:
+    """Lookup tables from design token values to token names
+
+    Built once per validator: every color is normalized to #rrggbb and mapped
+    to its first token (light mode before dark) and, for ``--fix``, to the
+    first token holding it in each mode (``mode_colors``) or in every mode
+    (``fixed_colors``); colors are also placed in a
+    k-d tree over Lab vectors for nearest-token queries, and spacing, radius
+    and font size tokens are kept as sorted pixel values for bisection.
+    """
+
+    def __init__(self, tokens: Dict):
+        """Index colors, spacing, radii and font sizes from a design-tokens.json dict"""
+        self.colors: Dict[str, str] = {}
+        self.mode_colors: Dict[str, Dict[str, str]] = {}
+        self.fixed_colors: Dict[str, str] = {}
+        self.spacing: List[Tuple[float, str, str]] = []
+        self.radii: List[Tuple[float, str, str]] = []
+        self.font_sizes: List[Tuple[float, str, str]] = []
+
+        modes = tokens.get('modes', {})
+        for mode in ['light', 'dark'] + sorted(set(modes) - {'light', 'dark'}):
+            for category, color_values in modes.get(mode, {}).get('colors', {}).items():
+                if not isinstance(color_values, dict):
+                    continue
+                for name, value in color_values.items():
+                    color = normalize_color(value) if isinstance(value, str) else None
+                    if color:
+                        self.colors.setdefault(color, f"colors.{category}.{name}")
+                        self.mode_colors.setdefault(mode, {}).setdefault(
+                            color, f"colors.{category}.{name}")
+
+        # A token's reference resolves to its value in whichever mode is active;
+        # modes leaving a token out inherit it from the default mode
+        default_colors = modes.get(default_mode(tokens), {}).get('colors', {})
+        tokens_in_order = dict.fromkeys(
+            (category, name)
+            for mode in ['light', 'dark'] + sorted(set(modes) - {'light', 'dark'})
+            for category, color_values in modes.get(mode, {}).get('colors', {}).items()
+            if isinstance(color_values, dict)
+            for name in color_values
+        )
+        for category, name in tokens_in_order:
+            values = set()
+            for mode_values in modes.values():
+                group = mode_values.get('colors', {}).get(category)
+                value = group.get(name) if isinstance(group, dict) else None
+                if value is None:
+                    value = default_colors.get(category, {}).get(name)
+                values.add(normalize_color(value) if isinstance(value, str) else None)
+            if len(values) == 1 and None not in values:
+                self.fixed_colors.setdefault(values.pop(), f"colors.{category}.{name}")
+
+        for name, value in tokens.get('spacing', {}).items():
+            px = css_length_to_px(value)
+            if px is not None:
+                self.spacing.append((px, f"spacing.{name}", str(value)))
+        for name, value in tokens.get('effects', {}).get('radii', {}).items():
+            px = css_length_to_px(value)
+            if px is not None:
+                self.radii.append((px, f"effects.radii.{name}", str(value)))
+        for name, value in tokens.get('typography', {}).get('sizes', {}).items():
+            px = css_length_to_px(value)
+            if px is not None:
+                self.font_sizes.append((px, f"typography.sizes.{name}", str(value)))
+        self.spacing.sort()
+        self.radii.sort()
+        self.font_sizes.sort()
+
+        self._tree = self._build([(hex_to_lab(c), c) for c in self.colors], 0)
+
+    def _build(self, points: List[Tuple[Tuple[float, float, float], str]], depth: int):
+        """Build a k-d tree node as (point, axis, left, right)"""
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda point: point[0][axis])
+        mid = len(points) // 2
+        return (points[mid], axis,
+                self._build(points[:mid], depth + 1),
+                self._build(points[mid + 1:], depth + 1))
+
+    def nearest_color(self, value: str) -> Optional[Dict]:
+        """Return the closest color token as {'token', 'value', 'distance'}"""
+        color = normalize_color(value)
+        if color is None or self._tree is None:
+            return None
+        if color in self.colors:
+            return {'token': self.colors[color], 'value': color, 'distance': 0.0}
+
+        target = hex_to_lab(color)
+        best = [None, math.inf]
+
+        def search(node) -> None:
+            if node is None:
+                return
+            (lab, hex_value), axis, left, right = node
+            distance = math.dist(lab, target)
+            if distance < best[1]:
+                best[0], best[1] = hex_value, distance
+            diff = target[axis] - lab[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            search(near)
+            if abs(diff) < best[1]:
+                search(far)
+
+        search(self._tree)
+        return {'token': self.colors[best[0]], 'value': best[0], 'distance': round(best[1], 2)}
+
+    def nearest_spacing(self, px: float) -> Optional[Dict]:
+        """Return the spacing token closest to a pixel value"""
+        return self._nearest_length(self.spacing, px)
+
+    def nearest_radius(self, px: float) -> Optional[Dict]:
+        """Return the border radius token closest to a pixel value"""
+        return self._nearest_length(self.radii, px)
+
+    def nearest_font_size(self, px: float) -> Optional[Dict]:
+        """Return the typography size token closest to a pixel value"""
+        return self._nearest_length(self.font_sizes, px)
+
+    @staticmethod
+    def _nearest_length(scale: List[Tuple[float, str, str]], px: float) -> Optional[Dict]:
+        """Bisect a sorted (px, token, value) scale for the closest entry"""
+        if not scale:
+            return None
+        i = bisect.bisect_left(scale, (px,))
+        candidates = scale[max(0, i - 1):i + 1]
+        best_px, token, value = min(candidates, key=lambda entry: abs(entry[0] - px))
+        return {'token': token, 'value': value, 'distance': abs(best_px - px)}
+
+    def fingerprint_data(self) -> Dict:
+        """Indexed values, for cache fingerprints"""
+        return {'colors': self.colors, 'spacing': self.spacing, 'radii': self.radii,
+                'font_sizes': self.font_sizes}
+
+
+class ScanSyntax:
+    """Compiled scanner patterns for one source language, as str or bytes
+
+    One search loop finds hex colors, the declarations of the properties some
+    rule is triggered by, and the starts of comments, strings and ``url()``
+    so whole regions can be jumped over instead of scanned. Every alternative
+    starts with a literal so the regex engine can skip ahead to candidate
+    characters.
+    """
+
+    COLOR = r'#(?:[0-9a-fA-F]{8}|[0-9a-fA-F]{6}|[0-9a-fA-F]{3,4})(?![\w-])'
+
+    # Follows a property name: an optional closing quote of a JS key and the colon
+    DECLARATION_SUFFIX = r'''['"]?[^\S\n]*:'''
+
+    # Comment, string and url() openings. CSS strings are always skipped, so
+    # they are matched whole; JS strings are matched whole only when they hold
+    # no '#' or ':' and are not an object key, so there is nothing to check in
+    # them, otherwise just the opening quote is.
+    CSS_REGIONS = r'''/\*|//|"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|"|'|url\('''
+    JS_REGIONS = (r'''/\*|//|"[^"\\\n#:]*"(?![^\S\n]*:)|'[^'\\\n#:]*'(?![^\S\n]*:)'''
+                  r'''|"|'|url\(''')
+
+    # A character before a property name that makes it something else: part
+    # of a longer name, a custom property, a SCSS variable or a media feature
+    PROPERTY_PREFIX = r'[\w$@(-]'
+
+    # Declaration value, up to the end of the declaration or a comment.
+    # Parentheses (one level nested) and, in JS, quotes are kept whole so
+    # commas in rgba() or a quoted shadow list do not end the value.
+    PARENS = r'\((?:[^()\n]|\([^()\n]*\))*\)'
+    CSS_VALUE = rf'(?:{PARENS}|[^;}}\n/(]|/(?![*/]))*'
+    JS_VALUE = rf'''(?:{PARENS}|'[^'\n]*'|"[^"\n]*"|`[^`\n]*`|[^;,}}\n/('"`]|/(?![*/]))*'''
+
+    # A character before a hex match that makes it part of a word, an HTML
+    # character reference (&#123;) or a URL fragment
+    COLOR_PREFIX = r'[\w&/]'
+
+    # A hex match followed by an opening brace is a CSS ID selector
+    SELECTOR_TAIL = r'[^;{}\n]*\{'
+
+    # What follows a string that is a JS object key
+    KEY_TAIL = r'[^\S\n]*:'
+
+    # JSX attributes whose strings never hold style values
+    UNRELATED_ATTRIBUTE = r'(?:href|src|alt|title|id|key|name|placeholder|aria-[\w-]+|data-[\w-]+)'
+
+    # Lines that are not audited at all
+    SKIP_LINE = r'[^\S\n]*(?:import |require)'
+
+    # Characters looked back from a string for an unrelated context
+    CONTEXT_WINDOW = 40
+
+    _cache: Dict[Tuple, 'ScanSyntax'] = {}
+
+    def __init__(self, language: str, binary: bool, properties: Tuple[str, ...] = (),
+                 colors: bool = True):
+        """Compile the patterns of ``language`` ('css', 'scss' or 'js')
+
+        ``properties`` are the declaration names to find and ``colors``
+        whether to find hex colors at all.
+        """
+        def compile_pattern(pattern: str):
+            return re.compile(pattern.encode() if binary else pattern)
+
+        def literal(text: str):
+            return text.encode() if binary else text
+
+        declarations = self.keyword_pattern(properties, self.DECLARATION_SUFFIX)
+        is_js = language == 'js'
+        alternatives = [self.COLOR] if colors else []
+        if declarations:
+            alternatives.append(declarations)
+        alternatives.append(self.JS_REGIONS if is_js else self.CSS_REGIONS)
+
+        self.language = language
+        self.binary = binary
+        self.declaration = compile_pattern(declarations) if declarations else None
+        self.key_tail = compile_pattern(self.KEY_TAIL)
+        self.scan = compile_pattern('|'.join(alternatives))
+        self.skip_line = compile_pattern(self.SKIP_LINE)
+        self.color_prefix = compile_pattern(self.COLOR_PREFIX)
+        self.property_prefix = compile_pattern(self.PROPERTY_PREFIX)
+        self.value = compile_pattern(self.JS_VALUE if is_js else self.CSS_VALUE)
+        self.selector_tail = None if is_js else compile_pattern(self.SELECTOR_TAIL)
+        self.unrelated_attribute = compile_pattern(self.UNRELATED_ATTRIBUTE)
+        self.string_bodies = {
+            literal(quote): compile_pattern(rf'(?:[^{quote}\\\n]|\\.)*{quote}')
+            for quote in ('"', "'")
+        }
+
+        self.newline = literal('\n')
+        self.hash = literal('#')
+        self.colon = literal(':')
+        self.slash = literal('/')
+        self.line_comment = literal('//')
+        self.comment_end = literal('*/')
+        self.url = literal('u')
+        self.close_paren = literal(')')
+        self.name_tail = literal('\'" \t:')
+        self.import_words = {literal('from'), literal('import')}
+        self.call_openers = (literal('require('), literal('import('))
+        self.assignment = (literal('='), literal('={'))
+        self.assignment_chars = literal('={')
+
+    def is_unrelated_string(self, content, start: int, line_start: int) -> bool:
+        """Whether a JS string is an import path or an unrelated attribute value"""
+        text = content[max(line_start, start - self.CONTEXT_WINDOW):start].rstrip()
+        if text.endswith(self.call_openers):
+            return True
+        attribute = text.endswith(self.assignment)
+        if attribute:
+            text = text.rstrip(self.assignment_chars)
+        words = text.rsplit(None, 1)
+        if not words:
+            return False
+        if attribute:
+            return self.unrelated_attribute.fullmatch(words[-1]) is not None
+        return words[-1] in self.import_words
+
+    @staticmethod
+    def keyword_pattern(words: Iterator[str], suffix: str) -> str:
+        """Regex alternation of words factored into a prefix trie
+
+        The regex engine tries alternatives one by one, so sharing prefixes
+        keeps the cost per candidate position low. The top level stays a
+        plain alternation with the suffix on each branch, which keeps the
+        literal prefix scan of the whole pattern.
+        """
+        trie: Dict = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node: Dict) -> str:
+            branches = [re.escape(char) + build(child)
+                        for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            if len(branches) == 1 and '' not in node:
+                return branches[0]
+            return '(?:' + '|'.join(branches) + ')' + ('?' if '' in node else '')
+
+        return '|'.join(re.escape(char) + build(child) + suffix
+                        for char, child in sorted(trie.items()))
+
+    @classmethod
+    def get(cls, language: str, binary: bool = False, properties: Tuple[str, ...] = (),
+            colors: bool = True) -> 'ScanSyntax':
+        """Return the cached syntax of a language, compiling it on first use"""
+        key = (language, binary, properties, colors)
+        if key not in cls._cache:
+            cls._cache[key] = cls(language, binary, properties, colors)
+        return cls._cache[key]
+
+
+# Rule classes every new DesignValidator runs, in report order
+RULE_REGISTRY: List[type] = []
+
+
+def register_rule(rule_class: type) -> type:
+    """Class decorator adding a rule to the registry"""
+    RULE_REGISTRY.append(rule_class)
+    return rule_class
+
+
+def camel_case(name: str) -> str:
+    """Spell a CSS property the way React style objects do (z-index -> zIndex)"""
+    return re.sub(r'-([a-z])', lambda match: match.group(1).upper(), name)
+
+
+class Rule:
+    """A design token check fed by the scanner
+
+    A rule declares what triggers it: ``properties`` are the CSS properties
+    (kebab-case; the camelCase of style objects is matched too) whose
+    declaration values it checks and ``colors`` asks for every hex color.
+    The scanner only searches for keywords some rule needs, and hands a
+    declaration only to the rules of its property, in files whose language
+    is in ``languages``.
+    """
+
+    category = ''       # Key of the rule's issues in audit results
+    rule_id = ''        # Rule id in machine-readable output
+    key = 'value'       # Issue field holding the offending value
+    title = ''          # Report section heading
+    label = ''          # Short name in watch output and report footers
+    summary = ''        # Message start, followed by the value
+    advice = ''         # How to fix it, after the value
+    languages = frozenset({'css', 'scss', 'js'})
+    properties: Tuple[str, ...] = ()
+    colors = False
+
+    def __init__(self, validator: 'DesignValidator'):
+        """Bind the rule to the validator holding its allowed values"""
+        self.validator = validator
+
+    def check(self, value: str, language: str) -> List[Tuple[int, str]]:
+        """Return (offset, offending value) pairs for a declaration value or color"""
+        raise NotImplementedError
+
+    def suggest(self, value: str) -> Optional[Dict]:
+        """Return the design token closest to an offending value, if any"""
+        return None
+
+    def token(self, literal: str) -> Optional[str]:
+        """Return the design token a literal value equals exactly, if any"""
+        return None
+
+    def literals(self, value: str, language: str) -> List[Tuple[int, str]]:
+        """Return (offset, source text) pairs of literals in a value that equal a token
+
+        Unlike ``check`` this ignores the allowed values; it feeds ``--fix``.
+        """
+        return []
+
+    @classmethod
+    def message(cls, value: str) -> str:
+        """Describe one violation"""
+        return f"{cls.summary} {value}; {cls.advice}"
+
+    @classmethod
+    def description(cls) -> str:
+        """Describe the rule"""
+        return f"{cls.summary}; {cls.advice}"
+
+
+@register_rule
+class ColorRule(Rule):
+    """Hex colors that are not design token values"""
+
+    category = 'colors'
+    rule_id = 'hardcoded-color'
+    key = 'color'
+    title = 'Hardcoded Colors'
+    label = 'color'
+    summary = 'Hardcoded color'
+    advice = 'use a design token instead'
+    colors = True
+
+    def check(self, value: str, language: str) -> List[Tuple[int, str]]:
+        # One lookup classifies the color against every mode's palette; colors
+        # valid in only some modes are settled by resolve_color_modes
+        if len(self.allowed_modes(value)) == len(self.validator.modes):
+            return []
+        return [(0, value)]
+
+    def allowed_modes(self, value: str) -> FrozenSet[str]:
+        """Return the color modes whose palette has a hex color"""
+        lower = value.lower()
+        color_modes = self.validator.color_modes
+        if len(lower) == 7:
+            return color_modes.get(lower, frozenset())
+        return color_modes.get(normalize_color(lower), frozenset())
+
+    def suggest(self, value: str) -> Optional[Dict]:
+        return self.validator.token_index.nearest_color(value)
+
+    def token(self, literal: str, mode: Optional[str] = None) -> Optional[str]:
+        """Return a token equal to a color in ``mode``, or in every mode when None
+
+        A reference outside a mode-scoped block resolves in any mode, so only
+        a token with the same value in all of them keeps the page as it was.
+        """
+        color = normalize_color(literal)
+        if color in self.validator.BASIC_COLORS:
+            return None
+        index = self.validator.token_index
+        if mode is None:
+            return index.fixed_colors.get(color)
+        return index.mode_colors.get(mode, {}).get(color)
+
+    def literals(self, value: str, language: str) -> List[Tuple[int, str]]:
+        # The fixer decides per mode; any color some token holds is a candidate
+        color = normalize_color(value)
+        if color in self.validator.BASIC_COLORS or color not in self.validator.token_index.colors:
+            return []
+        return [(0, value)]
+
+
+class LengthRule(Rule):
+    """Base of rules checking whole px lengths in declaration values"""
+
+    # Fractional and unit-suffixed numbers are left alone
+    PX_LENGTH = re.compile(r'(?<![\w.])\d+(?=px(?![\w-]))')
+
+    # A number ending the value, or a ternary branch, is a px length in React style objects too
+    JS_PX_LENGTH = re.compile(r'(?<![\w.])\d+(?=px(?![\w-])|\s*$|\s*:)')
+
+    def lengths(self, value: str, language: str) -> Iterator[re.Match]:
+        """Iterate the px length matches in a value"""
+        return (self.JS_PX_LENGTH if language == 'js' else self.PX_LENGTH).finditer(value)
+
+    def nearest(self, px: float) -> Optional[Dict]:
+        """Return the token of the rule's scale closest to a pixel value"""
+        raise NotImplementedError
+
+    def suggest(self, value: str) -> Optional[Dict]:
+        return self.nearest(int(value[:-2]))
+
+    def token(self, literal: str) -> Optional[str]:
+        px = css_length_to_px(literal)
+        entry = self.nearest(px) if px else None
+        return entry['token'] if entry and entry['distance'] == 0 else None
+
+    def literals(self, value: str, language: str) -> List[Tuple[int, str]]:
+        found = []
+        for match in self.lengths(value, language):
+            literal = match.group()
+            if value.startswith('px', match.end()):
+                literal += 'px'
+            if self.token(literal):
+                found.append((match.start(), literal))
+        return found
+
+
+@register_rule
+class SpacingRule(LengthRule):
+    """Padding, margin, gap and size lengths off the spacing scale"""
+
+    category = 'spacing'
+    rule_id = 'non-standard-spacing'
+    title = 'Non-standard Spacing'
+    label = 'spacing'
+    summary = 'Non-standard spacing'
+    advice = 'use a spacing token (4, 8, 12, 16, 20, 24, 32, 48, 64px)'
+    properties = tuple(
+        box + side
+        for box in ('padding', 'margin')
+        for side in ('', '-top', '-right', '-bottom', '-left', '-inline', '-inline-start',
+                     '-inline-end', '-block', '-block-start', '-block-end')
+    ) + ('gap', 'row-gap', 'column-gap', 'width', 'height',
+         'min-width', 'max-width', 'min-height', 'max-height')
+
+    def check(self, value: str, language: str) -> List[Tuple[int, str]]:
+        allowed = self.validator.ALLOWED_SPACING
+        return [(match.start(), f"{px}px") for match in self.lengths(value, language)
+                if (px := int(match.group())) not in allowed and px > 3]
+
+    def nearest(self, px: float) -> Optional[Dict]:
+        return self.validator.token_index.nearest_spacing(px)
+
+
+@register_rule
+class RadiusRule(LengthRule):
+    """Border radii off the radius scale"""
+
+    category = 'radius'
+    rule_id = 'non-standard-radius'
+    title = 'Non-standard Border Radius'
+    label = 'radius'
+    summary = 'Non-standard border radius'
+    advice = 'use a border radius token (4, 8, 12, 16px)'
+    properties = ('border-radius',) + tuple(
+        f"border-{corner}-radius"
+        for corner in ('top-left', 'top-right', 'bottom-left', 'bottom-right',
+                       'start-start', 'start-end', 'end-start', 'end-end')
+    )
+
+    def check(self, value: str, language: str) -> List[Tuple[int, str]]:
+        allowed = self.validator.ALLOWED_RADII
+        return [(match.start(), f"{px}px") for match in self.lengths(value, language)
+                if (px := int(match.group())) and px not in allowed]
+
+    def nearest(self, px: float) -> Optional[Dict]:
+        return self.validator.token_index.nearest_radius(px)
+
+
+@register_rule
+class FontSizeRule(Rule):
+    """Font sizes that are not in typography.sizes"""
+
+    category = 'typography'
+    rule_id = 'non-standard-font-size'
+    title = 'Non-standard Font Sizes'
+    label = 'font size'
+    summary = 'Non-standard font size'
+    advice = 'use a typography size token (12, 14, 16, 18, 20, 24, 30, 36px)'
+    properties = ('font-size',)
+
+    FONT_LENGTH = re.compile(r'(?<![\w.])(?:\d+(?:\.\d+)?|\.\d+)(?:px|rem)(?![\w-])')
+    JS_FONT_LENGTH = re.compile(r'(?<![\w.])(?:\d+(?:\.\d+)?|\.\d+)(?:(?:px|rem)(?![\w-])|(?=\s*$))')
+
+    def check(self, value: str, language: str) -> List[Tuple[int, str]]:
+        pattern = self.JS_FONT_LENGTH if language == 'js' else self.FONT_LENGTH
+        issues = []
+        for match in pattern.finditer(value):
+            length = match.group()
+            if length[-1].isdigit():
+                length += 'px'
+            if css_length_to_px(length) not in self.validator.allowed_font_sizes:
+                issues.append((match.start(), length))
+        return issues
+
+    def suggest(self, value: str) -> Optional[Dict]:
+        return self.validator.token_index.nearest_font_size(css_length_to_px(value))
+
+    def token(self, literal: str) -> Optional[str]:
+        entry = self.suggest(literal)
+        return entry['token'] if entry and entry['distance'] == 0 else None
+
+    def literals(self, value: str, language: str) -> List[Tuple[int, str]]:
+        pattern = self.JS_FONT_LENGTH if language == 'js' else self.FONT_LENGTH
+        return [(match.start(), match.group()) for match in pattern.finditer(value)
+                if self.token(match.group())]
+
+
+@register_rule
+class ShadowRule(Rule):
+    """Literal box shadows that are not effects.shadows values"""
+
+    category = 'shadows'
+    rule_id = 'non-standard-shadow'
+    title = 'Non-standard Shadows'
+    label = 'shadow'
+    summary = 'Non-standard shadow'
+    advice = 'use a shadow token (--shadow-subtle, --shadow-medium, --shadow-strong)'
+    properties = ('box-shadow',)
+
+    KEYWORDS = frozenset({'none', 'inherit', 'initial', 'unset', 'revert'})
+
+    def check(self, value: str, language: str) -> List[Tuple[int, str]]:
+        text = value.strip()
+        offset = len(value) - len(value.lstrip())
+        if language == 'js':
+            # Only string literals are checked; expressions may well be tokens
+            if len(text) < 2 or text[0] not in '\'"`' or text[-1] != text[0]:
+                return []
+            text = text[1:-1]
+            offset += 1
+        text = self.normalize(text)
+        if (not text or text in self.KEYWORDS or text.startswith(('var(', '$', '@'))
+                or '${' in text or text in self.validator.allowed_shadows):
+            return []
+        return [(offset, text)]
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        """Lowercase a shadow with single spaces, commas followed by one space"""
+        value = re.sub(r'\s*!important$', '', value.strip().lower())
+        value = re.sub(r'\s*,\s*', ', ', value)
+        return re.sub(r'\s+', ' ', value.replace('( ', '(').replace(' )', ')'))
+
+
+@register_rule
+class ZIndexRule(Rule):
+    """Z-index values off the effects.zIndex layers
+
+    Checks nothing unless the token file defines that group.
+    """
+
+    category = 'z-index'
+    rule_id = 'non-standard-z-index'
+    title = 'Non-standard Z-index'
+    label = 'z-index'
+    summary = 'Non-standard z-index'
+    advice = 'use a layer from the effects.zIndex tokens'
+    properties = ('z-index',)
+
+    NUMBER = re.compile(r'''\s*(['"]?)(-?\d+)\1\s*(?:!important\s*)?$''')
+
+    def check(self, value: str, language: str) -> List[Tuple[int, str]]:
+        allowed = self.validator.allowed_z_indices
+        if not allowed:
+            return []
+        match = self.NUMBER.match(value)
+        if not match or int(match.group(2)) in allowed:
+            return []
+        return [(match.start(2), match.group(2))]
+
+
+# Validator instance owned by each worker process in parallel audits
+_worker_validator = None
+
+
+def _init_audit_worker(tokens_path: Optional[str], options: Dict) -> None:
+    """Build the per-process validator used by parallel audit workers"""
+    global _worker_validator
+    _worker_validator = DesignValidator(tokens_path, **options)
+
+
+def _audit_file_worker(file_path: str) -> Tuple[str, Optional[Dict[str, List]]]:
+    """Audit one file in a worker, returning issues only when there are any"""
+    issues = _worker_validator.audit_file(file_path)
+    if any(issues.values()):
+        return file_path, issues
+    return file_path, None
+
+
+def _fix_file_worker(file_path: str, dry_run: bool) -> Dict:
+    """Fix one file in a worker"""
+    return TokenFixer(_worker_validator).fix_file(file_path, dry_run)
+
+
+def count_issues(file_issues: Dict[str, List]) -> int:
+    """Number of rule violations in one file's results, leaving out skipped entries"""
+    return sum(len(found) for category, found in file_issues.items() if category != 'skipped')
+
+
+class AuditCache:
+    """Persistent per-file audit results for incremental runs
+
+    Entries are keyed by absolute path and validated by mtime/size first, then
+    by content hash, so files that are merely touched are not re-scanned. The
+    whole cache is discarded when the fingerprint (allowed token sets and
+    validator source) differs from the one it was written with. When it is
+    saved, entries not looked up since the cache was loaded are dropped if
+    their file is gone or lies under a directory audited in this run (now
+    excluded); entries of other audit roots sharing the cache file are kept.
+    Without a ``cache_path`` the cache lives in memory only.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_path: Optional[str], fingerprint: str):
+        """Load the cache file, starting empty if it is missing or stale"""
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Dict] = {}
+        self.seen: Set[str] = set()
+        self.roots: Set[str] = set()
+        self.dirty = False
+
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get('version') == self.VERSION and data.get('fingerprint') == fingerprint:
+            self.entries = data.get('files', {})
+
+    def lookup(self, file_path: str) -> Tuple[bool, Optional[Dict[str, List]], Dict]:
+        """Return (hit, cached issues, entry key) for a file
+
+        The entry key carries the current stat and hash and is passed back to
+        ``store`` on a miss.
+        """
+        key = os.path.abspath(file_path)
+        self.seen.add(key)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False, None, {}
+
+        stamp = {'mtime': st.st_mtime_ns, 'size': st.st_size}
+        entry = self.entries.get(key)
+        if entry and entry['mtime'] == stamp['mtime'] and entry['size'] == stamp['size']:
+            return True, entry['issues'], stamp
+
+        with open(file_path, 'rb') as f:
+            stamp['hash'] = hashlib.sha1(f.read()).hexdigest()
+
+        if entry and entry['hash'] == stamp['hash']:
+            # Content unchanged, only refresh the stat part of the key
+            self.store(file_path, stamp, entry['issues'])
+            return True, entry['issues'], stamp
+
+        return False, None, stamp
+
+    def store(self, file_path: str, stamp: Dict, issues: Optional[Dict[str, List]]) -> None:
+        """Record the audit result for a file"""
+        if 'hash' not in stamp:
+            return
+        self.entries[os.path.abspath(file_path)] = dict(stamp, issues=issues)
+        self.dirty = True
+
+    def add_root(self, path: str) -> None:
+        """Record a directory audited in full, whose unseen entries are stale"""
+        self.roots.add(os.path.join(os.path.abspath(path), ''))
+
+    def save(self) -> None:
+        """Drop stale entries and write the cache atomically if anything changed"""
+        for key in self.entries.keys() - self.seen:
+            if key.startswith(tuple(self.roots)) or not os.path.exists(key):
+                del self.entries[key]
+                self.dirty = True
+        if not self.dirty or self.cache_path is None:
+            return
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': self.VERSION,
+                'fingerprint': self.fingerprint,
+                'files': self.entries,
+            }, f)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+
+class DesignValidator:
+    """Validate code files for design token compliance"""
+
+    # Scanner language by file extension; anything else is scanned as JS
+    LANGUAGES = {
+        '.css': 'css',
+        '.scss': 'scss',
+        '.sass': 'scss',
+        '.less': 'scss',
+    }
+
+    # Known allowed colors per color mode (from ACP design system)
+    MODE_COLORS = {
+        'light': frozenset({
+            '#ffffff', '#f4f6f8', '#eef4ff', '#e3f2fd', '#90caf9',
+            '#d7f5e9', '#4caf50', '#e8f2ff', '#2196f3',
+            '#e0f2f1', '#4db6ac', '#cbd7e0', '#cbd5e1',
+            '#1e3a8a', '#064e3b', '#1e40af', '#134e4a',
+        }),
+        'dark': frozenset({
+            '#1a1a1a', '#2d3748', '#1e3a5f', '#1e3a8a', '#60a5fa',
+            '#064e3b', '#10b981', '#1e40af', '#3b82f6',
+            '#134e4a', '#14b8a6', '#4b5563', '#555d6f',
+        }),
+    }
+
+    # Block preludes scoping their rules to a color mode: the name of a
+    # prefers-color-scheme query, a class (.dark, .theme-dark) or a data-theme attribute
+    MODE_PRELUDE = re.compile(
+        r'prefers-color-scheme\s*:\s*([\w-]+)|\.(?:theme-)?([\w-]+)'
+        r'|\[data-(?:theme|mode)\s*=\s*["\']?([\w-]+)'
+    )
+
+    # Comments, strings and the braces and semicolons that delimit block preludes
+    BLOCK_TOKEN = re.compile(r'/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|[{};\n]', re.S)
+    SCSS_BLOCK_TOKEN = re.compile(r'//[^\n]*|' + BLOCK_TOKEN.pattern, re.S)
+
+    # Allowed in every mode, and not tied to a token's meaning: basic black/white
+    BASIC_COLORS = frozenset({'#000000', '#ffffff'})
+
+    # Known allowed spacing values (10px grid)
+    ALLOWED_SPACING = {4, 8, 12, 16, 20, 24, 32, 48, 64}
+
+    # Known allowed border-radius values
+    ALLOWED_RADII = {4, 8, 12, 16}
+
+    # Known allowed font sizes in px (typography.sizes at a 16px root)
+    DEFAULT_FONT_SIZES = frozenset({12, 14, 16, 18, 20, 24, 30, 36})
+
+    # Known allowed box shadows (effects.shadows), as ShadowRule.normalize spells them
+    DEFAULT_SHADOWS = frozenset({
+        '0 1px 2px rgba(0, 0, 0, 0.05)',
+        '0 4px 6px rgba(0, 0, 0, 0.1)',
+        '0 10px 15px rgba(0, 0, 0, 0.15)',
+    })
+
+    # Directory names never descended into
+    SKIP_DIRS = frozenset({'node_modules', '.next', 'dist', 'build', '.git'})
+
+    # Hunk header in `git diff --unified=0` output
+    HUNK_PATTERN = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+    # Characters read per block when streaming a file
+    READ_BLOCK_SIZE = 1 << 20
+
+    # Files at least this many bytes are scanned through mmap
+    MMAP_THRESHOLD = 8 << 20
+
+    # Bytes kept on each side of a match in memory-mapped issue snippets
+    SNIPPET_CONTEXT = 40
+
+    # Files handed to a worker process per task in parallel audits
+    AUDIT_CHUNK_SIZE = 32
+
+    def __init__(self, tokens_path: Optional[str] = None,
+                 max_file_size: Optional[int] = None,
+                 max_line_length: Optional[int] = None,
+                 profile: bool = False):
+        """Initialize validator with optional tokens file
+
+        Files larger than ``max_file_size`` bytes and lines longer than
+        ``max_line_length`` characters are skipped and listed under
+        ``skipped`` in the file results. With ``profile`` the time and
+        issue count of every rule is recorded in ``rule_stats``.
+        """
+        self.tokens_path = tokens_path
+        self.max_file_size = max_file_size
+        self.max_line_length = max_line_length
+        self.tokens = {}
+        self.issues: List[Dict] = []
+        self.rules: List[Rule] = [rule_class(self) for rule_class in RULE_REGISTRY]
+        self._scanners: Dict[Tuple[str, bool, bool], Tuple[ScanSyntax, Dict, List]] = {}
+
+        self.profile = profile
+        # rule_id -> [calls, issues, seconds]
+        self.rule_stats: Dict[str, List] = {}
+        self.scan_seconds = 0.0
+        self.files_profiled = 0
+
+        if tokens_path and Path(tokens_path).exists():
+            self.tokens = load_tokens(tokens_path, resolve=True)
+
+        # mode -> allowed colors, and color -> modes allowing it, both as #rrggbb
+        self.allowed_colors = self._build_allowed_colors()
+        self.modes = tuple(self.allowed_colors)
+        self.color_modes: Dict[str, FrozenSet[str]] = {}
+        for mode, colors in self.allowed_colors.items():
+            for color in colors:
+                self.color_modes[color] = self.color_modes.get(color, frozenset()) | {mode}
+        self.allowed_font_sizes, self.allowed_shadows = self._build_allowed_effects()
+        # The design system has no layer scale of its own; only token files define one
+        self.allowed_z_indices = frozenset(
+            value for value in self.tokens.get('effects', {}).get('zIndex', {}).values()
+            if isinstance(value, int) and not isinstance(value, bool)
+        )
+
+        # Suggestions fall back to the bundled tokens without changing allowed values
+        index_tokens = self.tokens
+        if not index_tokens and DEFAULT_TOKENS_PATH.exists():
+            index_tokens = load_tokens(DEFAULT_TOKENS_PATH, resolve=True)
+        self.token_index = TokenIndex(index_tokens)
+        self._annotations: Dict[Tuple[str, str], Optional[Dict]] = {}
+
+    def _build_allowed_colors(self) -> Dict[str, FrozenSet[str]]:
+        """Build the allowed colors of every mode: defaults, basic colors and token colors
+
+        Token files may add modes besides light and dark.
+        """
+        token_modes = self.tokens.get('modes', {})
+        allowed = {}
+        for mode in ['light', 'dark'] + sorted(set(token_modes) - {'light', 'dark'}):
+            colors = set(self.MODE_COLORS.get(mode, ())) | self.BASIC_COLORS
+            for color_values in token_modes.get(mode, {}).get('colors', {}).values():
+                if not isinstance(color_values, dict):
+                    continue
+                for value in color_values.values():
+                    color = normalize_color(value) if isinstance(value, str) else None
+                    if color:
+                        colors.add(color)
+            allowed[mode] = frozenset(colors)
+        return allowed
+
+    def _build_allowed_effects(self) -> Tuple[FrozenSet[float], FrozenSet[str]]:
+        """Build the allowed font sizes (px) and shadows: defaults and token values"""
+        font_sizes = set(self.DEFAULT_FONT_SIZES)
+        for value in self.tokens.get('typography', {}).get('sizes', {}).values():
+            px = css_length_to_px(value) if isinstance(value, str) else None
+            if px is not None:
+                font_sizes.add(px)
+        shadows = set(self.DEFAULT_SHADOWS)
+        for value in self.tokens.get('effects', {}).get('shadows', {}).values():
+            if isinstance(value, str):
+                shadows.add(ShadowRule.normalize(value))
+        return frozenset(font_sizes), frozenset(shadows)
+
+    def options(self) -> Dict:
+        """Constructor options besides the tokens path, for rebuilding the validator"""
+        return {
+            'max_file_size': self.max_file_size,
+            'max_line_length': self.max_line_length,
+        }
+
+    def fingerprint(self) -> str:
+        """Hash of everything that affects audit results, used to key caches"""
+        digest = hashlib.sha1()
+        digest.update(json.dumps({
+            'colors': {mode: sorted(colors) for mode, colors in self.allowed_colors.items()},
+            'spacing': sorted(self.ALLOWED_SPACING),
+            'radii': sorted(self.ALLOWED_RADII),
+            'font_sizes': sorted(self.allowed_font_sizes),
+            'shadows': sorted(self.allowed_shadows),
+            'z_indices': sorted(self.allowed_z_indices),
+            'rules': [rule.rule_id for rule in self.rules],
+            'options': self.options(),
+            'index': self.token_index.fingerprint_data(),
+        }).encode())
+        digest.update(Path(__file__).read_bytes())
+        return digest.hexdigest()
+
+    def audit_file(self, file_path: str, content: Optional[str] = None) -> Dict[str, List]:
+        """Audit a single file for design violations
+
+        With ``content`` that text is audited as the file (e.g. its staged
+        version) instead of reading ``file_path``, whose suffix still picks
+        the language.
+        """
+        path = Path(file_path)
+        if content is None and not path.exists():
+            return {'errors': [f"File not found: {file_path}"]}
+
+        file_issues = {rule.category: [] for rule in self.rules}
+        file_issues['skipped'] = []
+
+        size = len(content.encode('utf-8')) if content is not None else path.stat().st_size
+        if self.max_file_size is not None:
+            if size > self.max_file_size:
+                file_issues['skipped'].append({
+                    'line': None,
+                    'reason': f"file is {size} bytes (limit {self.max_file_size})",
+                })
+                return file_issues
+
+        language = self.LANGUAGES.get(path.suffix.lower(), 'js')
+        if self.profile:
+            scan_start = time.perf_counter()
+        if content is not None:
+            import io
+            self._scan_stream(io.StringIO(content), file_issues, language)
+        elif size >= self.MMAP_THRESHOLD:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                self._scan_content(buf, file_issues, language)
+        else:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                self._scan_stream(f, file_issues, language)
+        if self.profile:
+            self.scan_seconds += time.perf_counter() - scan_start
+            self.files_profiled += 1
+
+        self.resolve_color_modes(file_issues, path, content, language)
+        self._annotate_issues(file_issues)
+        return file_issues
+
+    def _annotate_issues(self, file_issues: Dict[str, List]) -> None:
+        """Attach the nearest design token to each issue"""
+        for rule in self.rules:
+            for issue in file_issues[rule.category]:
+                memo_key = (rule.category, issue[rule.key])
+                if memo_key not in self._annotations:
+                    self._annotations[memo_key] = rule.suggest(issue[rule.key])
+                suggestion = self._annotations[memo_key]
+                if suggestion:
+                    issue['suggestion'] = suggestion
+
+    def resolve_color_modes(self, file_issues: Dict[str, List], path: Path,
+                            content: Optional[str], language: str) -> None:
+        """Settle colors that are valid in only some modes by where they appear
+
+        Inside a block scoped to a mode (see ``MODE_PRELUDE``) a color must
+        be in that mode's palette and is reported as wrong in that mode
+        only. Elsewhere the mode can't be told, so any palette is accepted.
+        The file is only read again when such colors were found in CSS.
+        """
+        rule = next((rule for rule in self.rules if rule.colors), None)
+        if rule is None:
+            return
+        issues = file_issues[rule.category]
+        if not any(rule.allowed_modes(issue['color']) for issue in issues):
+            return
+
+        blocks = []
+        if language != 'js':
+            if content is None:
+                # latin-1 keeps byte columns for memory-mapped files
+                encoding = 'latin-1' if path.stat().st_size >= self.MMAP_THRESHOLD else 'utf-8'
+                with open(path, 'r', encoding=encoding, errors='ignore') as f:
+                    content = f.read()
+            blocks = self._mode_blocks(content, language)
+
+        kept = []
+        for issue in issues:
+            allowed = rule.allowed_modes(issue['color'])
+            if allowed:
+                mode = self.mode_at(blocks, issue['line'], issue['column'])
+                if mode is None or mode in allowed:
+                    continue
+                issue['modes'] = [mode]
+            kept.append(issue)
+        file_issues[rule.category] = kept
+
+    @staticmethod
+    def mode_at(blocks: List[Tuple[Tuple[int, int], Tuple[int, int], str]],
+                line: int, column: int) -> Optional[str]:
+        """Return the mode of the innermost of ``_mode_blocks`` holding a position, if any"""
+        where = (line, column)
+        # Nested blocks start later, so the innermost comes last
+        return next((mode for start, end, mode in reversed(blocks) if start <= where < end), None)
+
+    def _mode_blocks(self, content: str, language: str) -> List[Tuple[Tuple[int, int], Tuple[int, int], str]]:
+        """Find the blocks scoped to a color mode as ((line, column), (line, column), mode)
+
+        Positions count like issues do: 1-based lines and columns.
+        """
+        token_pattern = self.SCSS_BLOCK_TOKEN if language == 'scss' else self.BLOCK_TOKEN
+        blocks = []
+        stack: List[Optional[int]] = []
+        line_num = 1
+        line_start = 0
+        prelude_start = 0
+        for match in token_pattern.finditer(content):
+            token = match.group()
+            start = match.start()
+            if token == '\n':
+                line_num += 1
+                line_start = match.end()
+                continue
+            if token == '{':
+                mode = None
+                for groups in self.MODE_PRELUDE.findall(content, prelude_start, start):
+                    name = next(group for group in groups if group).lower()
+                    if name in self.allowed_colors:
+                        mode = name
+                        break
+                if mode is not None:
+                    blocks.append([(line_num, start - line_start + 1), None, mode])
+                stack.append(len(blocks) - 1 if mode is not None else None)
+            elif token == '}':
+                if stack:
+                    index = stack.pop()
+                    if index is not None:
+                        blocks[index][1] = (line_num, start - line_start + 1)
+            elif token != ';':
+                # Comments may span lines; strings stay part of the prelude
+                newlines = token.count('\n')
+                if newlines:
+                    line_num += newlines
+                    line_start = start + token.rfind('\n') + 1
+                if token[0] not in '"\'':
+                    prelude_start = match.end()
+                continue
+            prelude_start = match.end()
+
+        # Blocks left open run to the end of the file
+        return [(start, end or (line_num + 1, 0), mode) for start, end, mode in blocks]
+
+    @staticmethod
+    def issues_for_mode(file_issues: Optional[Dict[str, List]],
+                        mode: str) -> Optional[Dict[str, List]]:
+        """Drop the violations of one file that do not apply in a color mode
+
+        Issues without ``modes`` apply in every mode; ``all`` keeps
+        everything. Returns None when nothing is left.
+        """
+        if file_issues is None or mode == 'all':
+            return file_issues
+        selected = {
+            category: [issue for issue in found if mode in issue.get('modes', (mode,))]
+            for category, found in file_issues.items()
+        }
+        return selected if any(selected.values()) else None
+
+    def results_for_mode(self, audit_results: Dict, mode: str) -> Dict:
+        """Apply ``issues_for_mode`` to results in the ``audit_directory`` shape"""
+        if mode == 'all' or 'issues' not in audit_results:
+            return audit_results
+        issues = {}
+        for file_path, file_issues in audit_results['issues'].items():
+            selected = self.issues_for_mode(file_issues, mode)
+            if selected:
+                issues[file_path] = selected
+        return dict(audit_results, files_with_issues=len(issues), issues=issues)
+
+    def _scanner(self, language: str, binary: bool,
+                 fix: bool = False) -> Tuple[ScanSyntax, Dict, List]:
+        """Return the scan syntax and rule dispatch of a language, built on first use
+
+        Only rules covering the language take part. The dispatch maps each
+        property name (kebab and camelCase, as str or bytes like the content)
+        to the (rule, check) pairs it triggers; the list holds those of the
+        color rules. With ``profile`` every check is wrapped in a timer. With
+        ``fix`` the rules' ``literals`` stand in for their checks.
+        """
+        key = (language, binary, fix)
+        if key not in self._scanners:
+            if fix:
+                checks = {
+                    rule: rule.literals for rule in self.rules
+                    if language in rule.languages and type(rule).literals is not Rule.literals
+                }
+            else:
+                checks = {
+                    rule: self._timed_check(rule) if self.profile else rule.check
+                    for rule in self.rules if language in rule.languages
+                }
+            dispatch: Dict = {}
+            for rule, check in checks.items():
+                for prop in rule.properties:
+                    for name in {prop, camel_case(prop)}:
+                        name = name.encode() if binary else name
+                        dispatch.setdefault(name, []).append((rule, check))
+            color_checks = [(rule, check) for rule, check in checks.items() if rule.colors]
+            names = tuple(sorted(name.decode() if binary else name for name in dispatch))
+            syntax = ScanSyntax.get(language, binary, names, bool(color_checks))
+            self._scanners[key] = (syntax, dispatch, color_checks)
+        return self._scanners[key]
+
+    def _timed_check(self, rule: Rule) -> Callable[[str, str], List[Tuple[int, str]]]:
+        """Wrap a rule's check to add its calls, issues and time to ``rule_stats``"""
+        stats = self.rule_stats.setdefault(rule.rule_id, [0, 0, 0.0])
+        check = rule.check
+        clock = time.perf_counter
+
+        def timed_check(value: str, language: str) -> List[Tuple[int, str]]:
+            start = clock()
+            found = check(value, language)
+            stats[2] += clock() - start
+            stats[0] += 1
+            stats[1] += len(found)
+            return found
+
+        return timed_check
+
+    def format_profile(self) -> str:
+        """Describe where scan time went: the tokenizer and each rule"""
+        rule_seconds = sum(stats[2] for stats in self.rule_stats.values())
+        rows = [('tokenizer', '-', '-', self.scan_seconds - rule_seconds)]
+        rows += sorted(
+            ((rule_id, calls, issues, seconds)
+             for rule_id, (calls, issues, seconds) in self.rule_stats.items()),
+            key=lambda row: row[3], reverse=True,
+        )
+        total = self.scan_seconds or 1.0
+        lines = [
+            f"Rule profile: {self.files_profiled} file(s) scanned in {self.scan_seconds * 1000:.1f} ms",
+            f"  {'rule':<24} {'calls':>9} {'issues':>9} {'time ms':>10} {'share':>6}",
+        ]
+        for name, calls, issues, seconds in rows:
+            lines.append(f"  {name:<24} {calls:>9} {issues:>9} {seconds * 1000:>10.1f} "
+                         f"{seconds / total:>6.0%}")
+        return '\n'.join(lines)
+
+    def _scan_stream(self, f, file_issues: Dict[str, List], language: str) -> None:
+        """Scan an open text file block by block
+
+        Each block is cut at its last newline and the partial line is carried
+        into the next one, so memory stays bounded by the block size plus the
+        longest line (or ``max_line_length``, past which a line is dropped).
+        A block comment left open at the end of a block carries over too.
+        """
+        line_num = 1
+        carry = ''
+        discarding = False
+        in_comment = False
+
+        while True:
+            block = f.read(self.READ_BLOCK_SIZE)
+            if not block:
+                break
+
+            if discarding:
+                # Drop the rest of an over-long line
+                newline = block.find('\n')
+                if newline == -1:
+                    continue
+                block = block[newline + 1:]
+                line_num += 1
+                discarding = False
+
+            data = carry + block if carry else block
+            cut = data.rfind('\n') + 1
+            if cut:
+                in_comment = self._scan_content(data[:cut], file_issues, language,
+                                                line_num, in_comment)
+                line_num += data.count('\n', 0, cut)
+            carry = data[cut:]
+
+            if self.max_line_length is not None and len(carry) > self.max_line_length:
+                self._skip_line(file_issues, line_num)
+                carry = ''
+                discarding = True
+
+        if carry and not discarding:
+            self._scan_content(carry, file_issues, language, line_num, in_comment)
+
+    def _skip_line(self, file_issues: Dict[str, List], line_num: int) -> None:
+        """Record a line left unaudited for exceeding max_line_length"""
+        file_issues['skipped'].append({
+            'line': line_num,
+            'reason': f"line longer than {self.max_line_length} characters",
+        })
+
+    def _scan_content(self, content, file_issues: Dict[str, List], language: str,
+                      first_line: int = 1, in_comment: bool = False, fix: bool = False) -> bool:
+        """Tokenize text or a memory-mapped buffer, appending issues per category
+
+        Comments, ``url()`` and strings are jumped over as whole regions; in
+        JS only strings in unrelated contexts (imports, ``href=`` and similar
+        attributes) are, so style object values and styled-components
+        templates are still checked. Colors and the values of declarations
+        are handed to the rules they trigger. Line numbers are tracked by
+        counting newlines between consecutive tokens.
+
+        Memory-mapped buffers are usually minified onto one huge line, so
+        their issues carry a byte ``column`` and a snippet of
+        ``SNIPPET_CONTEXT`` bytes around the match instead of the whole line.
+
+        With ``fix`` the literals equal to a design token are collected
+        instead, see ``token_literals``.
+
+        Returns whether the content ends inside a block comment, for the
+        ``in_comment`` of the next block.
+        """
+        binary = not isinstance(content, str)
+        syntax, dispatch, color_checks = self._scanner(language, binary, fix)
+        search = syntax.scan.search
+        newline = syntax.newline
+        skip_line_match = syntax.skip_line.match
+        color_prefix_match = syntax.color_prefix.match
+        property_prefix_match = syntax.property_prefix.match
+        value_match = syntax.value.match
+        hash_mark = syntax.hash
+        colon = syntax.colon
+        name_tail = syntax.name_tail
+        report = self._report_literal if fix else self._report
+        line_num = first_line
+        line_start = 0
+        line_end = -1
+        skip_line = False
+        pos = 0
+        end = len(content)
+        # Set to the closing quote while scanning inside a checked string
+        limit = end
+
+        if in_comment:
+            pos = content.find(syntax.comment_end)
+            if pos == -1:
+                return True
+            pos += 2
+
+        while True:
+            match = search(content, pos, limit)
+            if match is None:
+                if limit == end:
+                    return False
+                pos = limit + 1
+                limit = end
+                continue
+            start, pos = match.span()
+
+            if start > line_end:
+                if binary:
+                    # mmap has no count(), and long gaps between lines are rare
+                    found = content.find(newline, line_start, start)
+                    while found != -1:
+                        line_num += 1
+                        line_start = found + 1
+                        found = content.find(newline, line_start, start)
+                else:
+                    line_num += content.count(newline, line_start, start)
+                    line_start = content.rfind(newline, line_start, start) + 1
+                line_end = content.find(newline, start)
+                if line_end == -1:
+                    line_end = end
+                skip_line = skip_line_match(content, line_start) is not None
+                if (not skip_line and self.max_line_length is not None
+                        and line_end - line_start > self.max_line_length):
+                    self._skip_line(file_issues, line_num)
+                    skip_line = True
+
+            if skip_line:
+                pos = max(line_end, pos)
+                continue
+
+            token = match.group()
+            first = token[:1]
+
+            if first == hash_mark:
+                if start and color_prefix_match(content, start - 1):
+                    continue
+                if syntax.selector_tail and syntax.selector_tail.match(content, pos):
+                    continue
+                color = token.decode('ascii') if binary else token
+                for rule, check in color_checks:
+                    for offset, found in check(color, language):
+                        report(file_issues, rule.category, rule.key, found, content,
+                               start + offset, pos, line_num, line_start, line_end, limit)
+
+            elif token[-1:] == colon:
+                if start and property_prefix_match(content, start - 1):
+                    continue
+                value_end = value_match(content, pos).end()
+                value = content[pos:value_end]
+                if binary:
+                    # One char per byte keeps offsets as byte columns
+                    value = value.decode('latin-1')
+                for rule, check in dispatch[token.rstrip(name_tail)]:
+                    for offset, found in check(value, language):
+                        report(file_issues, rule.category, rule.key, found, content,
+                               pos + offset, value_end, line_num, line_start, line_end, limit)
+
+            elif limit < end:
+                # Comment and string openings inside a checked string are text
+                continue
+
+            elif first == syntax.slash:
+                if token == syntax.line_comment:
+                    pos = line_end
+                    continue
+                pos = content.find(syntax.comment_end, pos)
+                if pos == -1:
+                    return True
+                pos += 2
+
+            elif first == syntax.url:
+                close = content.find(syntax.close_paren, pos, line_end)
+                if close != -1:
+                    pos = close + 1
+
+            elif len(token) > 1:
+                # A whole string token holds nothing to check
+                continue
+
+            else:
+                closing = syntax.string_bodies[token].match(content, pos, line_end)
+                if closing is None:
+                    # Unterminated on this line, e.g. an apostrophe in JSX text
+                    continue
+                if syntax.language != 'js':
+                    pos = closing.end()
+                elif syntax.key_tail.match(content, closing.end()):
+                    # An object key: rescan it as a declaration or skip it
+                    if syntax.declaration is None or not syntax.declaration.match(content, pos):
+                        pos = closing.end()
+                elif syntax.is_unrelated_string(content, start, line_start):
+                    pos = closing.end()
+                else:
+                    limit = closing.end() - 1
+
+    def _report(self, file_issues: Dict[str, List], category: str, key: str, value: str,
+                content, start: int, stop: int, line_num: int,
+                line_start: int, line_end: int, limit: int) -> None:
+        """Append an issue for content[start:stop] with its line or a snippet as code
+
+        ``limit`` is the closing quote of the checked string being scanned,
+        or the content length outside one; only ``_report_literal`` uses it.
+        """
+        if isinstance(content, str):
+            code = content[line_start:line_end].strip()
+        else:
+            code = self._snippet(content, start, stop, line_start, line_end)
+        file_issues[category].append({
+            'line': line_num,
+            'column': start - line_start + 1,
+            key: value,
+            'code': code,
+        })
+
+    def _report_literal(self, file_issues: Dict[str, List], category: str, key: str, value: str,
+                        content: str, start: int, stop: int, line_num: int,
+                        line_start: int, line_end: int, limit: int) -> None:
+        """Append a literal equal to a token with its offset and enclosing quote, if any"""
+        file_issues[category].append({
+            'line': line_num,
+            'offset': start,
+            'literal': value,
+            'line_start': line_start,
+            'quote': content[limit] if limit < len(content) else '',
+        })
+
+    def token_literals(self, content: str, language: str) -> Dict[str, List]:
+        """Find the literals in text that equal a design token, per rule category
+
+        Each entry holds the literal, its offset and line, where its line
+        starts and the quote of the string it sits in ('' outside strings).
+        """
+        found = {rule.category: [] for rule in self.rules}
+        found['skipped'] = []
+        self._scan_content(content, found, language, fix=True)
+        return found
+
+    def iter_fixes(self, target: str, extensions: List[str] = None, jobs: int = 1,
+                   exclude: Optional[List[str]] = None,
+                   dry_run: bool = False) -> Iterator[Dict]:
+        """Rewrite literals equal to design tokens in a file or directory tree
+
+        Yields the ``TokenFixer.fix_file`` result of every file in walk
+        order. Each file is rewritten with one write, or only diffed with
+        ``dry_run``; with ``jobs`` > 1 files are fixed in a process pool.
+        """
+        if extensions is None:
+            extensions = ['.tsx', '.ts', '.jsx', '.js', '.css', '.scss']
+
+        path = Path(target)
+        if path.is_file():
+            files = iter([str(path)])
+        elif path.is_dir():
+            files = self._iter_files(path, extensions, exclude)
+        else:
+            raise FileNotFoundError(f"Path not found: {target}")
+
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        if jobs == 1:
+            fixer = TokenFixer(self)
+            for file_path in files:
+                yield fixer.fix_file(file_path, dry_run)
+            return
+
+        import functools
+        import multiprocessing
+        with multiprocessing.Pool(jobs, initializer=_init_audit_worker,
+                                  initargs=(self.tokens_path, self.options())) as pool:
+            yield from pool.imap(functools.partial(_fix_file_worker, dry_run=dry_run),
+                                 files, chunksize=self.AUDIT_CHUNK_SIZE)
+
+    def _snippet(self, buf: mmap.mmap, start: int, end: int,
+                 line_start: int, line_end: int) -> str:
+        """Decode a truncated slice of a line around a match"""
+        lo = max(line_start, start - self.SNIPPET_CONTEXT)
+        hi = min(line_end, end + self.SNIPPET_CONTEXT)
+        snippet = buf[lo:hi].decode('utf-8', errors='ignore').strip()
+        if lo > line_start:
+            snippet = '…' + snippet
+        if hi < line_end:
+            snippet += '…'
+        return snippet
+
+    def audit_directory(self, directory: str, extensions: List[str] = None,
+                        jobs: int = 1, exclude: Optional[List[str]] = None,
+                        cache_path: Optional[str] = None) -> Dict:
+        """Audit all files in a directory
+
+        ``exclude`` takes .gitignore-style patterns for paths to skip and
+        ``cache_path`` enables the incremental ``AuditCache``. With
+        ``jobs`` > 1 files are fanned out to a process pool in chunks of
+        ``AUDIT_CHUNK_SIZE``; results stream back in walk order, so the merged
+        output is identical to a serial run. ``jobs`` <= 0 uses every CPU.
+        """
+        if not Path(directory).is_dir():
+            return {'error': f"Directory not found: {directory}"}
+
+        all_issues = {}
+        file_count = 0
+
+        for file_path, issues in self.iter_directory(directory, extensions, jobs,
+                                                     exclude, cache_path):
+            file_count += 1
+            # Only include files with issues
+            if issues is not None:
+                all_issues[file_path] = issues
+
+        return {
+            'total_files_scanned': file_count,
+            'files_with_issues': len(all_issues),
+            'issues': all_issues,
+        }
+
+    def iter_directory(self, directory: str, extensions: List[str] = None,
+                       jobs: int = 1, exclude: Optional[List[str]] = None,
+                       cache_path: Optional[str] = None,
+                       cache: Optional[AuditCache] = None
+                       ) -> Iterator[Tuple[str, Optional[Dict[str, List]]]]:
+        """Yield (file_path, issues or None) for every audited file in walk order
+
+        Takes the same options as ``audit_directory`` but streams results, so
+        callers can write them out without holding the whole audit in memory.
+        An already loaded ``cache`` (e.g. the resident one of ``serve``) is
+        used instead of ``cache_path`` and left to the caller to save.
+        """
+        if extensions is None:
+            extensions = ['.tsx', '.ts', '.jsx', '.js', '.css', '.scss']
+
+        path = Path(directory)
+        if not path.is_dir():
+            raise FileNotFoundError(f"Directory not found: {directory}")
+
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
 
-class DesignValidator:
-    """Validate code files for design token compliance"""
+        files = self._iter_files(path, extensions, exclude)
+        if cache is not None:
+            cache.add_root(path)
+            yield from self._audit_files_cached(files, jobs, cache)
+            return
+        if not cache_path:
+            yield from self._audit_files(files, jobs)
+            return
 
-    # Pattern for hex colors
-    HEX_COLOR_PATTERN = re.compile(r'["\']?(#[0-9a-fA-F]{6}|#[0-9a-fA-F]{3})["\']?')
+        cache = AuditCache(cache_path, self.fingerprint())
+        cache.add_root(path)
+        yield from self._audit_files_cached(files, jobs, cache)
+        cache.save()
 
-    # Pattern for hardcoded pixel values (spacing)
-    PX_PATTERN = re.compile(r'(\d+)px')
+    def audit_changes(self, target: str, ref: Optional[str] = None, staged: bool = False,
+                      extensions: List[str] = None,
+                      exclude: Optional[List[str]] = None) -> Dict:
+        """Audit only lines changed according to git
 
-    # Pattern for border-radius values
-    RADIUS_PATTERN = re.compile(r'border-radius\s*:\s*(\d+)px')
+        Compares the working tree against ``ref`` (default ``HEAD``), or the
+        index against ``HEAD`` when ``staged`` is set, and keeps only issues
+        on added or modified lines. Working-tree runs also audit every line
+        of untracked (not ignored) files. Staged runs audit the staged
+        contents, so unstaged edits cannot shift the line numbers.
+        """
+        if extensions is None:
+            extensions = ['.tsx', '.ts', '.jsx', '.js', '.css', '.scss']
 
-    # Known allowed colors (from ACP design system)
-    ALLOWED_COLORS = {
-        '#ffffff', '#f4f6f8', '#eef4ff', '#e3f2fd', '#90caf9',
-        '#d7f5e9', '#4caf50', '#e8f2ff', '#2196f3',
-        '#e0f2f1', '#4db6ac', '#cbd7e0', '#cbd5e1',
-        '#1a1a1a', '#2d3748', '#1e3a5f', '#1e3a8a', '#60a5fa',
-        '#064e3b', '#10b981', '#1e40af', '#3b82f6',
-        '#134e4a', '#14b8a6', '#4b5563', '#555d6f',
-        '#000000', '#000', '#fff', # Allow basic black/white
-    }
+        path = Path(target)
+        if path.is_file():
+            directory, pathspec = path.parent, path.name
+        elif path.is_dir():
+            directory, pathspec = path, '.'
+        else:
+            return {'error': f"Path not found: {target}"}
 
-    # Known allowed spacing values (10px grid)
-    ALLOWED_SPACING = {4, 8, 12, 16, 20, 24, 32, 48, 64}
+        cmd = ['git', '-C', str(directory), 'diff', '--no-color', '--no-ext-diff', '--relative',
+               '--diff-filter=ACMR']
+        if staged:
+            cmd.append('--cached')
+        elif ref:
+            cmd.append(ref)
 
-    # Known allowed border-radius values
-    ALLOWED_RADII = {4, 8, 12, 16}
+        import subprocess
+        try:
+            # Names come NUL-separated and unquoted, in the order of the patch
+            names = subprocess.run(cmd + ['--name-only', '-z', '--', pathspec], capture_output=True,
+                                   text=True, check=True).stdout.split('\0')
+            diff = subprocess.run(cmd + ['--unified=0', '--', pathspec], capture_output=True,
+                                  text=True, check=True).stdout
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, 'stderr', '') or str(e)
+            return {'error': f"git diff failed: {stderr.strip()}"}
 
-    def __init__(self, tokens_path: Optional[str] = None):
-        """Initialize validator with optional tokens file"""
-        self.tokens = {}
-        self.issues: List[Dict] = []
+        changed: Dict[str, Optional[set]] = dict(
+            self._parse_diff_lines(diff, [name for name in names if name]))
+        if not staged:
+            cmd = ['git', '-C', str(directory), 'ls-files', '--others', '--exclude-standard',
+                   '-z', '--', pathspec]
+            try:
+                untracked = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+            except (OSError, subprocess.CalledProcessError) as e:
+                stderr = getattr(e, 'stderr', '') or str(e)
+                return {'error': f"git ls-files failed: {stderr.strip()}"}
+            # None: every line is new
+            changed.update((rel_path, None) for rel_path in untracked.split('\0') if rel_path)
 
-        if tokens_path and Path(tokens_path).exists():
-            with open(tokens_path, 'r') as f:
-                self.tokens = json.load(f)
-                self._update_allowed_colors()
-
-    def _update_allowed_colors(self) -> None:
-        """Update allowed colors from loaded tokens"""
-        for mode in ['light', 'dark']:
-            colors = self.tokens.get('modes', {}).get(mode, {}).get('colors', {})
-            for category, color_values in colors.items():
-                for name, value in color_values.items():
-                    self.ALLOWED_COLORS.add(value.lower())
+        ext_set = {ext if ext.startswith('.') else f".{ext}" for ext in extensions}
+        file_rules, dir_rules = self._compile_excludes(exclude or [])
 
-    def audit_file(self, file_path: str) -> Dict[str, List]:
-        """Audit a single file for design violations"""
-        path = Path(file_path)
-        if not path.exists():
-            return {'errors': [f"File not found: {file_path}"]}
+        all_issues = {}
+        file_count = 0
+        for rel_path, lines in changed.items():
+            if os.path.splitext(rel_path)[1] not in ext_set:
+                continue
+            if any(part in self.SKIP_DIRS for part in rel_path.split('/')[:-1]):
+                continue
+            if self._path_excluded(rel_path, file_rules, dir_rules):
+                continue
 
-        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            lines = content.split('\n')
+            file_count += 1
+            file_path = str(directory / rel_path)
+            content = None
+            if staged:
+                cmd = ['git', '-C', str(directory), 'show', f":./{rel_path}"]
+                try:
+                    content = subprocess.run(cmd, capture_output=True, check=True).stdout.decode(
+                        'utf-8', errors='ignore')
+                except (OSError, subprocess.CalledProcessError) as e:
+                    stderr = getattr(e, 'stderr', b'') or str(e).encode()
+                    return {'error': f"git show failed: {stderr.decode(errors='ignore').strip()}"}
+            issues = self.audit_file(file_path, content)
+            issues = {
+                cat: [issue for issue in found if lines is None or issue['line'] in lines]
+                for cat, found in issues.items() if cat != 'skipped'
+            }
+            if any(issues.values()):
+                all_issues[file_path] = issues
 
-        file_issues = {
-            'colors': [],
-            'spacing': [],
-            'radius': [],
+        return {
+            'total_files_scanned': file_count,
+            'files_with_issues': len(all_issues),
+            'issues': all_issues,
         }
 
-        for line_num, line in enumerate(lines, 1):
-            # Skip comments and imports
-            if line.strip().startswith(('/*', '//', 'import ', 'require')):
+    def _parse_diff_lines(self, diff: str, names: List[str]) -> Dict[str, set]:
+        """Map each file in a zero-context diff to its added/modified line numbers
+
+        ``names`` are the diff's paths from ``--name-only -z``, one per
+        ``diff --git`` header in order, so header text (quoted, or with a tab
+        after names with spaces) is never parsed.
+        """
+        changed: Dict[str, set] = {}
+        files = iter(names)
+        current = None
+        for line in diff.splitlines():
+            if line.startswith('diff --git '):
+                current = next(files, None)
+            elif current is not None and line.startswith('@@'):
+                match = self.HUNK_PATTERN.match(line)
+                if match:
+                    start = int(match.group(1))
+                    count = int(match.group(2)) if match.group(2) is not None else 1
+                    changed.setdefault(current, set()).update(range(start, start + count))
+        return changed
+
+    def _iter_files(self, path: Path, extensions: List[str],
+                    exclude: Optional[List[str]] = None,
+                    include_dirs: bool = False) -> Iterator[str]:
+        """Yield auditable file paths under a directory in a single walk
+
+        Skipped and excluded directories are pruned before descending, and
+        entries are visited in sorted order so the walk is deterministic.
+        With ``include_dirs`` the directories that are descended into
+        (including ``path`` itself) are yielded as well.
+        """
+        ext_set = {ext if ext.startswith('.') else f".{ext}" for ext in extensions}
+        file_rules, dir_rules = self._compile_excludes(exclude or [])
+
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            if include_dirs:
+                yield str(path / rel_dir) if rel_dir else str(path)
+            try:
+                with os.scandir(path / rel_dir if rel_dir else path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
                 continue
 
-            # Check for hardcoded colors
-            color_matches = self.HEX_COLOR_PATTERN.findall(line)
-            for color in color_matches:
-                if color.lower() not in self.ALLOWED_COLORS:
-                    file_issues['colors'].append({
-                        'line': line_num,
-                        'color': color,
-                        'code': line.strip(),
-                    })
-
-            # Check for suspicious spacing values (avoid false positives)
-            if any(css_prop in line for css_prop in ['padding', 'margin', 'gap', 'width', 'height']):
-                px_matches = self.PX_PATTERN.findall(line)
-                for px_value in px_matches:
-                    try:
-                        value = int(px_value)
-                        if value not in self.ALLOWED_SPACING and value not in [0, 1, 2, 3]:
-                            file_issues['spacing'].append({
-                                'line': line_num,
-                                'value': f"{value}px",
-                                'code': line.strip(),
-                            })
-                    except ValueError:
-                        pass
-
-            # Check border-radius values
-            if 'border-radius' in line or 'borderRadius' in line:
-                radius_matches = self.RADIUS_PATTERN.findall(line)
-                for radius_value in radius_matches:
-                    try:
-                        value = int(radius_value)
-                        if value not in self.ALLOWED_RADII:
-                            file_issues['radius'].append({
-                                'line': line_num,
-                                'value': f"{value}px",
-                                'code': line.strip(),
-                            })
-                    except ValueError:
-                        pass
+            subdirs = []
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    mode = entry.stat(follow_symlinks=False).st_mode
+                except OSError:
+                    continue
 
-        return file_issues
+                if stat.S_ISDIR(mode):
+                    if entry.name in self.SKIP_DIRS:
+                        continue
+                    if self._excluded(rel_path, dir_rules):
+                        continue
+                    subdirs.append(rel_path)
+                elif os.path.splitext(entry.name)[1] in ext_set:
+                    if self._excluded(rel_path, file_rules):
+                        continue
+                    yield entry.path
+
+            # Reversed so the stack pops subdirectories in sorted order
+            stack.extend(reversed(subdirs))
+
+    def _is_auditable(self, root: Path, file_path: str, extensions: List[str],
+                      exclude: Optional[List[str]] = None) -> bool:
+        """Check a path under root against the same filters as the directory walk"""
+        ext_set = {ext if ext.startswith('.') else f".{ext}" for ext in extensions}
+        if os.path.splitext(file_path)[1] not in ext_set:
+            return False
+        rel_path = Path(os.path.relpath(file_path, root)).as_posix()
+        if rel_path.startswith('../'):
+            return False
+        parts = rel_path.split('/')
+        if any(part in self.SKIP_DIRS for part in parts[:-1]):
+            return False
+        file_rules, dir_rules = self._compile_excludes(exclude or [])
+        return not self._path_excluded(rel_path, file_rules, dir_rules)
+
+    @staticmethod
+    def _excluded(rel_path: str, rules: List[Tuple[re.Pattern, bool]]) -> bool:
+        """Whether the last rule matching a path, if any, excludes it rather than re-including it"""
+        for rule, negated in reversed(rules):
+            if rule.match(rel_path):
+                return not negated
+        return False
+
+    @classmethod
+    def _path_excluded(cls, rel_path: str, file_rules: List[Tuple[re.Pattern, bool]],
+                       dir_rules: List[Tuple[re.Pattern, bool]]) -> bool:
+        """Whether a file or any directory above it is excluded
+
+        As in .gitignore, a file in an excluded directory can't be re-included.
+        """
+        parts = rel_path.split('/')
+        for i in range(1, len(parts)):
+            if cls._excluded('/'.join(parts[:i]), dir_rules):
+                return True
+        return cls._excluded(rel_path, file_rules)
+
+    @staticmethod
+    def _compile_excludes(patterns: List[str]) -> Tuple[List[Tuple[re.Pattern, bool]],
+                                                        List[Tuple[re.Pattern, bool]]]:
+        """Compile .gitignore-style patterns into (file, directory) rules
+
+        Each rule is (matcher, negated). Patterns without a slash match a name
+        at any depth, patterns with one are anchored to the audit root, a
+        trailing slash restricts a pattern to directories, ``**`` spans any
+        number of directories, and a leading ``!`` re-includes what earlier
+        patterns excluded: the last matching pattern wins (``\\!`` is a
+        literal ``!``).
+        """
+        file_rules = []
+        dir_rules = []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith('#'):
+                continue
+
+            negated = pattern.startswith('!')
+            if negated or pattern.startswith('\\!'):
+                pattern = pattern[1:]
+
+            dir_only = pattern.endswith('/')
+            pattern = pattern.rstrip('/')
+            anchored = '/' in pattern
+            pattern = pattern.lstrip('/')
+
+            regex = ''
+            i = 0
+            while i < len(pattern):
+                if pattern.startswith('**/', i):
+                    regex += '(?:.*/)?'
+                    i += 3
+                elif pattern.startswith('**', i):
+                    regex += '.*'
+                    i += 2
+                elif pattern[i] == '*':
+                    regex += '[^/]*'
+                    i += 1
+                elif pattern[i] == '?':
+                    regex += '[^/]'
+                    i += 1
+                elif pattern[i] == '[' and ']' in pattern[i + 2:]:
+                    end = pattern.index(']', i + 2)
+                    members = pattern[i + 1:end]
+                    if members.startswith('!'):
+                        members = '^' + members[1:]
+                    regex += '[' + members + ']'
+                    i = end + 1
+                else:
+                    regex += re.escape(pattern[i])
+                    i += 1
+
+            rule = re.compile(('^' if anchored else '^(?:.*/)?') + regex + '$')
+            dir_rules.append((rule, negated))
+            if not dir_only:
+                file_rules.append((rule, negated))
+
+        return file_rules, dir_rules
 
-    def audit_directory(self, directory: str, extensions: List[str] = None) -> Dict:
-        """Audit all files in a directory"""
+    def _audit_files(self, files: Iterator[str],
+                     jobs: int) -> Iterator[Tuple[str, Optional[Dict[str, List]]]]:
+        """Audit files serially or in a process pool, yielding results in input order"""
+        if jobs == 1:
+            for file_path in files:
+                issues = self.audit_file(file_path)
+                if not any(issues.values()):
+                    issues = None
+                yield file_path, issues
+            return
+
+        import multiprocessing
+        with multiprocessing.Pool(jobs, initializer=_init_audit_worker,
+                                  initargs=(self.tokens_path, self.options())) as pool:
+            yield from pool.imap(_audit_file_worker, files, chunksize=self.AUDIT_CHUNK_SIZE)
+
+    def _audit_files_cached(self, files: Iterator[str], jobs: int,
+                            cache: AuditCache) -> Iterator[Tuple[str, Optional[Dict[str, List]]]]:
+        """Audit only files missing from the cache, yielding all results in input order"""
+        lookups = []
+        misses = []
+        for file_path in files:
+            hit, issues, stamp = cache.lookup(file_path)
+            lookups.append((file_path, hit, issues, stamp))
+            if not hit:
+                misses.append(file_path)
+
+        fresh = self._audit_files(iter(misses), jobs)
+        for file_path, hit, issues, stamp in lookups:
+            if not hit:
+                _, issues = next(fresh)
+                cache.store(file_path, stamp, issues)
+            yield file_path, issues
+
+    def watch(self, directory: str, extensions: List[str] = None,
+              exclude: Optional[List[str]] = None, jobs: int = 1,
+              debounce: float = 0.05, poll_interval: float = 0.5, out=None,
+              mode: str = 'all') -> None:
+        """Audit a directory, then re-audit touched files until interrupted
+
+        Uses inotify where available and falls back to polling mtimes. Bursts
+        of events are debounced for ``debounce`` seconds, then only the touched
+        files are audited and the added (+) and resolved (-) issues printed.
+        Only violations in color ``mode`` are shown.
+        """
         if extensions is None:
             extensions = ['.tsx', '.ts', '.jsx', '.js', '.css', '.scss']
+        out = out or sys.stdout
+        root = Path(directory)
 
-        path = Path(directory)
-        if not path.is_dir():
-            return {'error': f"Directory not found: {directory}"}
-
-        all_issues = {}
-        file_count = 0
+        state: Dict[str, Dict[str, List]] = {}
+        for file_path, issues in self.iter_directory(directory, extensions, jobs, exclude):
+            issues = self.issues_for_mode(issues, mode)
+            if issues is not None:
+                state[file_path] = issues
+        self._print_watch_summary(state, out)
 
-        for ext in extensions:
-            for file_path in path.rglob(f"*{ext}"):
-                # Skip node_modules and common build directories
-                if any(skip in str(file_path) for skip in ['node_modules', '.next', 'dist', 'build']):
+        def snapshot() -> Dict[str, Tuple[int, int]]:
+            stamps = {}
+            for file_path in self._iter_files(root, extensions, exclude):
+                try:
+                    st = os.stat(file_path)
+                except OSError:
                     continue
+                stamps[file_path] = (st.st_mtime_ns, st.st_size)
+            return stamps
+
+        try:
+            watcher = InotifyWatcher(self._iter_files(root, extensions, exclude, include_dirs=True),
+                                     lambda path: self._is_watched_dir(root, path, exclude))
+        except OSError:
+            watcher = PollingWatcher(snapshot, poll_interval)
+        print(f"Watching {directory} ({watcher.name}), press Ctrl+C to stop", file=out, flush=True)
 
-                file_count += 1
-                issues = self.audit_file(str(file_path))
+        try:
+            while True:
+                changed = watcher.wait(debounce)
+                started = time.perf_counter()
+                if changed is None:
+                    # Events were lost, fall back to a full re-audit
+                    changed = set(state) | set(self._iter_files(root, extensions, exclude))
 
-                # Only include files with issues
-                if any(issues.get(cat, []) for cat in ['colors', 'spacing', 'radius']):
-                    all_issues[str(file_path)] = issues
+                touched = 0
+                for file_path in sorted(changed):
+                    if not self._is_auditable(root, file_path, extensions, exclude):
+                        continue
+                    touched += 1
+                    old = state.pop(file_path, None)
+                    new = None
+                    if os.path.isfile(file_path):
+                        new = self.issues_for_mode(self.audit_file(file_path), mode)
+                        if new is not None and not count_issues(new):
+                            new = None
+                    if new is not None:
+                        state[file_path] = new
+                    self._print_watch_diff(file_path, old, new, out)
 
+                if touched:
+                    elapsed = (time.perf_counter() - started) * 1000
+                    print(f"  re-audited {touched} file(s) in {elapsed:.0f}ms", file=out)
+                    self._print_watch_summary(state, out)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+
+    def _is_watched_dir(self, root: Path, path: str, exclude: Optional[List[str]]) -> bool:
+        """Whether a directory created while watching should be watched too"""
+        rel_path = Path(os.path.relpath(path, root)).as_posix()
+        parts = rel_path.split('/')
+        if rel_path.startswith('../') or any(part in self.SKIP_DIRS for part in parts):
+            return False
+        _, dir_rules = self._compile_excludes(exclude or [])
+        return not any(self._excluded('/'.join(parts[:i]), dir_rules)
+                       for i in range(1, len(parts) + 1))
+
+    @staticmethod
+    def _issue_keys(issues: Optional[Dict[str, List]]) -> Set[Tuple]:
+        """Comparable (category, line, column, value) keys of a file's issues"""
+        if not issues:
+            return set()
         return {
-            'total_files_scanned': file_count,
-            'files_with_issues': len(all_issues),
-            'issues': all_issues,
+            (category, issue['line'], issue.get('column') or 0, issue.get('color') or issue.get('value'))
+            for category, found in issues.items() if category != 'skipped'
+            for issue in found
         }
 
+    def _print_watch_diff(self, file_path: str, old: Optional[Dict[str, List]],
+                          new: Optional[Dict[str, List]], out) -> None:
+        """Print issues that appeared (+) or went away (-) in one file"""
+        before = self._issue_keys(old)
+        after = self._issue_keys(new)
+        labels = {rule.category: rule.label for rule in self.rules}
+        for sign, keys in (('-', before - after), ('+', after - before)):
+            for category, line, column, value in sorted(keys, key=lambda k: (k[1], k[2], k[0])):
+                print(f"{sign} {file_path}:{line}:{column} {labels[category]} {value}", file=out)
+
+    @staticmethod
+    def _print_watch_summary(state: Dict[str, Dict[str, List]], out) -> None:
+        """Print the current issue totals"""
+        total = sum(count_issues(issues) for issues in state.values())
+        print(f"{total} issue(s) in {len(state)} file(s)", file=out, flush=True)
+
+    @staticmethod
+    def _fix_hint(issue: Dict, default: str) -> str:
+        """Describe the suggested token of an issue, or fall back to a generic hint"""
+        suggestion = issue.get('suggestion')
+        if not suggestion:
+            return default
+        return f"Use design token `{suggestion['token']}` ({suggestion['value']})"
+
     def generate_report(self, audit_results: Dict, mode: str = 'light') -> str:
         """Generate a compliance report from audit results"""
         report = f'''# ACP Design Token Compliance Report
@@ -195,91 +2031,1013 @@ Mode: {mode}
             report += "✓ No design token compliance issues found!\n"
             return report
 
-        # Group by issue type
-        color_issues = []
-        spacing_issues = []
-        radius_issues = []
+        for rule in self.rules:
+            found = [(file_path, issue) for file_path, file_issues in issues.items()
+                     for issue in file_issues.get(rule.category, [])]
+            if not found:
+                continue
+            report += f"### {rule.title} ({len(found)} issues)\n\n"
+            for file_path, issue in found[:10]:  # Limit to first 10
+                report += f"**{file_path}:{issue['line']}**\n"
+                report += f"- {rule.key.capitalize()}: `{issue[rule.key]}`\n"
+                if 'modes' in issue:
+                    report += f"- Wrong in: {', '.join(issue['modes'])} mode\n"
+                report += f"- Line: `{issue['code']}`\n"
+                report += f"- Fix: {self._fix_hint(issue, rule.advice[:1].upper() + rule.advice[1:])}\n\n"
+            if len(found) > 10:
+                report += f"... and {len(found) - 10} more {rule.label} issues\n\n"
+
+        skipped = [(file_path, issue) for file_path, file_issues in issues.items()
+                   for issue in file_issues.get('skipped', [])]
+        if skipped:
+            report += f"### Skipped ({len(skipped)} files or lines not audited)\n\n"
+            for file_path, issue in skipped[:10]:
+                location = f"{file_path}:{issue['line']}" if issue['line'] else file_path
+                report += f"- **{location}**: {issue['reason']}\n"
+            if len(skipped) > 10:
+                report += f"... and {len(skipped) - 10} more skipped\n"
+            report += "\n"
+
+        return report
+
+
+class TokenFixer:
+    """Rewrite hardcoded values that equal a design token into token references
+
+    Only colors, spacing, radii and font sizes whose value is exactly a token
+    are touched, found by the validator's tokenizer. CSS and SCSS get the
+    ``var(--...)`` custom properties design-tokens-converter.py emits. In
+    JS/TSX a whole string or bare number becomes a ``designTokens``
+    reference, a literal in a template literal becomes ``${designTokens...}``
+    and a Tailwind arbitrary color such as ``bg-[#2196f3]`` becomes its
+    ``acp-`` color class. Literals elsewhere in strings, in at-rules and in
+    variable definitions are left alone. A color is only replaced by a token
+    with that value in every mode, or, inside a CSS block scoped to a mode,
+    in that mode, so no theme renders differently.
+    """
+
+    # CSS custom property prefix per token group, as design-tokens-converter.py names them
+    CSS_PREFIXES = (
+        ('colors.', '--color-'),
+        ('spacing.', '--space-'),
+        ('effects.radii.', '--radius-'),
+        ('typography.sizes.', '--font-size-'),
+    )
+
+    # Statements whose literals are never rewritten in CSS and SCSS: at-rule
+    # preludes, custom property and SCSS variable definitions
+    CSS_SKIP_PREFIXES = ('@', '--', '$')
+
+    # A CSS declaration outside a string in JS, i.e. in a multi-line template literal
+    TEMPLATE_DECLARATION = re.compile(r'\s*[a-z][a-z-]*\s*:')
+
+    IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*$')
+
+    def __init__(self, validator: DesignValidator):
+        """Fix with the tokens and rules of a validator"""
+        self.validator = validator
+        self.rules = {rule.category: rule for rule in validator.rules}
+
+    def fix_file(self, file_path: str, dry_run: bool = False) -> Dict:
+        """Rewrite one file with a single write, or only diff it with ``dry_run``
+
+        Returns the file's ``edits`` count, its unified ``diff`` (dry runs
+        only), whether it now ``needs_import`` of designTokens and any
+        ``error`` that kept it from being fixed.
+        """
+        result = {'file': file_path, 'edits': 0, 'diff': None, 'needs_import': False}
+        path = Path(file_path)
+        try:
+            size = path.stat().st_size
+            if self.validator.max_file_size is not None and size > self.validator.max_file_size:
+                return result
+            # newline='' keeps CRLF line endings as they are
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            result['error'] = str(e)
+            return result
+
+        language = self.validator.LANGUAGES.get(path.suffix.lower(), 'js')
+        edits = self.edits(text, language)
+        if not edits:
+            return result
+
+        parts = []
+        pos = 0
+        for start, end, replacement in edits:
+            parts.append(text[pos:start])
+            parts.append(replacement)
+            pos = end
+        parts.append(text[pos:])
+        fixed = ''.join(parts)
+
+        result['edits'] = len(edits)
+        result['needs_import'] = 'designTokens' in fixed and 'designTokens' not in text
+        if dry_run:
+            import difflib
+            result['diff'] = ''.join(difflib.unified_diff(
+                text.splitlines(True), fixed.splitlines(True),
+                f"a/{file_path}", f"b/{file_path}"))
+        else:
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.write(fixed)
+        return result
+
+    def edits(self, text: str, language: str) -> List[Tuple[int, int, str]]:
+        """Return the (start, end, replacement) edits of a file's text in order"""
+        edits = []
+        blocks = None
+        for category, literals in self.validator.token_literals(text, language).items():
+            rule = self.rules.get(category)
+            for found in literals:
+                mode = None
+                if rule.colors and language != 'js':
+                    if blocks is None:
+                        blocks = self.validator._mode_blocks(text, language)
+                    mode = self.validator.mode_at(blocks, found['line'],
+                                                  found['offset'] - found['line_start'] + 1)
+                edit = self._edit(text, language, rule, found, mode)
+                if edit:
+                    edits.append(edit)
+        edits.sort()
+        return edits
+
+    def _edit(self, text: str, language: str, rule: Rule, found: Dict,
+              mode: Optional[str] = None) -> Optional[Tuple[int, int, str]]:
+        """Return the edit replacing one literal, or None to leave it
+
+        ``mode`` is the color mode of the CSS block the literal sits in, if any.
+        """
+        literal = found['literal']
+        start = found['offset']
+        end = start + len(literal)
+        token = rule.token(literal, mode) if rule.colors else rule.token(literal)
+        if token is None:
+            return None
+        # A leading minus can't be applied to a reference as it is
+        negative = not rule.colors and text[start - 1:start] == '-'
+        if language != 'js':
+            head = text[found['line_start']:start]
+            statement = head[max(head.rfind(';'), head.rfind('{'), head.rfind('}')) + 1:].lstrip()
+            if statement.startswith(self.CSS_SKIP_PREFIXES):
+                return None
+            if negative:
+                return start - 1, end, f"calc(-1 * var({self.css_variable(token)}))"
+            return start, end, f"var({self.css_variable(token)})"
+
+        reference = self.ts_reference(token)
+        # Declaration values are tokenized whole, strings included
+        quote = found['quote'] or self._enclosing_quote(text, found['line_start'], start)
+        if quote == '`':
+            return start, end, f"${{{reference}}}"
+        if quote:
+            if text[start - 1] == quote and text[end] == quote:
+                # The whole string; a JSX attribute value needs braces
+                if text[start - 2:start - 1] == '=':
+                    return start - 1, end + 1, f"{{{reference}}}"
+                return start - 1, end + 1, reference
+            if (rule.colors and text[start - 2:start] == '-[' and text[end:end + 1] == ']'
+                    and token.startswith('colors.')):
+                return start - 1, end + 1, 'acp-' + token[len('colors.'):].replace('.', '-')
+            return None
+
+        if not rule.colors and literal[-1].isdigit():
+            # A bare number in a style object; `16;` would be invalid CSS in a template,
+            # and token values are strings, so `-16` has no reference
+            if text[end:end + 1] == ';' or negative:
+                return None
+            return start, end, reference
+        if self.TEMPLATE_DECLARATION.match(text, found['line_start']):
+            return start, end, f"${{{reference}}}"
+        return None
+
+    @staticmethod
+    def _enclosing_quote(text: str, line_start: int, start: int) -> str:
+        """Return the quote of the string on a line that ``start`` lies in, '' if none"""
+        quote = ''
+        escaped = False
+        for char in text[line_start:start]:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif quote:
+                if char == quote:
+                    quote = ''
+            elif char in '\'"`':
+                quote = char
+        return quote
+
+    def css_variable(self, token: str) -> str:
+        """Name the CSS custom property of a token"""
+        for group, prefix in self.CSS_PREFIXES:
+            if token.startswith(group):
+                return (prefix + token[len(group):].replace('.', '-')).replace('_', '-')
+        raise ValueError(f"No CSS custom property for token: {token}")
+
+    def ts_reference(self, token: str) -> str:
+        """Spell the designTokens member expression of a token"""
+        return 'designTokens' + ''.join(
+            f".{part}" if self.IDENTIFIER.match(part) else f"['{part}']"
+            for part in token.split('.')
+        )
+
+
+class InotifyWatcher:
+    """Report changed paths under a directory tree using Linux inotify
+
+    inotify is reached through ctypes so no extra package is needed; an
+    OSError from the constructor means the caller should poll instead.
+    """
+
+    name = 'inotify'
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+
+    WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+                  | IN_CREATE | IN_DELETE)
+
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, directories: Iterator[str], accept_dir: Callable[[str], bool]):
+        """Start watching the given directories"""
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, 'inotify is only available on Linux')
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.accept_dir = accept_dir
+        self.watches: Dict[int, str] = {}
+        try:
+            for directory in directories:
+                self.add_dir(directory)
+        except OSError:
+            self.close()
+            raise
+
+    def add_dir(self, directory: str) -> None:
+        """Watch one directory (not recursive)"""
+        import ctypes
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.watches[wd] = directory
+
+    def wait(self, debounce: float) -> Optional[Set[str]]:
+        """Block until something changes, then collect events until quiet for ``debounce`` seconds
+
+        Returns the changed paths, or None if the kernel queue overflowed.
+        """
+        changed: Set[str] = set()
+        overflow = False
+        timeout = None
+        while True:
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+            if not ready:
+                if changed or overflow:
+                    return None if overflow else changed
+                continue
+            overflow |= self._read_events(changed)
+            timeout = debounce
+
+    def _read_events(self, changed: Set[str]) -> bool:
+        """Drain pending events into ``changed``; True on queue overflow"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        overflow = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            if mask & self.IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+
+            directory = self.watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and self.accept_dir(path):
+                    # Watch the new subtree and treat everything in it as changed
+                    for root, dirs, files in os.walk(path):
+                        dirs[:] = [d for d in dirs if self.accept_dir(os.path.join(root, d))]
+                        try:
+                            self.add_dir(root)
+                        except OSError:
+                            continue
+                        changed.update(os.path.join(root, f) for f in files)
+                elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                    overflow = True
+                continue
+            changed.add(path)
+
+        return overflow
+
+    def close(self) -> None:
+        """Release the inotify descriptor"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Report changed paths by comparing periodic (mtime, size) snapshots"""
+
+    name = 'polling'
+
+    def __init__(self, snapshot: Callable[[], Dict[str, Tuple[int, int]]], interval: float):
+        """Take the initial snapshot"""
+        self.snapshot = snapshot
+        self.interval = interval
+        self.stamps = snapshot()
+
+    def wait(self, debounce: float) -> Optional[Set[str]]:
+        """Poll until the snapshot differs, then return the paths that changed"""
+        while True:
+            time.sleep(self.interval)
+            stamps = self.snapshot()
+            changed = {
+                path for path in stamps.keys() | self.stamps.keys()
+                if stamps.get(path) != self.stamps.get(path)
+            }
+            self.stamps = stamps
+            if changed:
+                return changed
 
+    def close(self) -> None:
+        """Nothing to release"""
+
+
+class ValidatorServer:
+    """Answer audit requests from one resident validator over a Unix socket
+
+    Requests and responses are JSON-RPC 2.0 objects, one per line, and a
+    connection may carry any number of them. Tokens, compiled patterns and
+    an in-memory ``AuditCache`` stay warm between requests, so a request
+    costs only the scanning of files that changed since they were last seen.
+
+    Methods:
+    - ``ping``: server pid and cached file count
+    - ``audit``: ``path`` plus optional ``mode``, ``extensions``, ``exclude``,
+      ``changed_since``, ``staged`` and ``format`` (``json`` or ``markdown``);
+      returns ``results`` in the ``audit_directory`` shape and, for markdown,
+      the rendered ``report``
+    - ``shutdown``: stop the server
+    """
+
+    def __init__(self, validator: DesignValidator, cache_path: Optional[str] = None):
+        """Wrap a validator with a resident result cache"""
+        self.validator = validator
+        import threading
+
+        self.cache = AuditCache(cache_path, validator.fingerprint())
+        self.lock = threading.Lock()
+        # The socketserver while serve_forever runs; stopping is set by ``shutdown``
+        self.server = None
+        self.stopping = False
+
+    def handle_request(self, request) -> Optional[Dict]:
+        """Dispatch one JSON-RPC request; notifications (no id) get no response
+
+        Anything but a request object, batches included, is an invalid request.
+        """
+        if not isinstance(request, dict):
+            return self._error(None, -32600, "Invalid Request: expected a JSON-RPC request object")
+        request_id = request.get('id')
+        method = request.get('method')
+        params = request.get('params') or {}
+        if not isinstance(params, dict):
+            return self._error(request_id, -32602, "Invalid params: expected an object")
+
+        try:
+            if method == 'ping':
+                result = {'pid': os.getpid(), 'files_cached': len(self.cache.entries)}
+            elif method == 'audit':
+                result = self._audit(params)
+            elif method == 'shutdown':
+                # The connection handler stops the server once the reply is sent
+                self.stopping = True
+                result = {'stopping': True}
+            else:
+                return self._error(request_id, -32601, f"Method not found: {method}")
+        except (KeyError, TypeError) as e:
+            return self._error(request_id, -32602, f"Invalid params: {e}")
+        except Exception as e:
+            return self._error(request_id, -32000, str(e))
+
+        if request_id is None:
+            return None
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    @staticmethod
+    def _error(request_id, code: int, message: str) -> Dict:
+        """Build a JSON-RPC error response"""
+        return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+    def _audit(self, params: Dict) -> Dict:
+        """Run an audit like the command line would, through the resident cache"""
+        target = params['path']
+        path = Path(target)
+        extensions = params.get('extensions')
+        exclude = params.get('exclude')
+
+        with self.lock:
+            if params.get('changed_since') or params.get('staged'):
+                results = self.validator.audit_changes(target, params.get('changed_since'),
+                                                       bool(params.get('staged')),
+                                                       extensions, exclude)
+            elif path.is_file():
+                hit, issues, stamp = self.cache.lookup(target)
+                if not hit:
+                    issues = self.validator.audit_file(target)
+                    if 'errors' in issues:
+                        raise FileNotFoundError(issues['errors'][0])
+                    if not any(issues.values()):
+                        issues = None
+                    self.cache.store(target, stamp, issues)
+                results = _single_file_results(target, issues or {})
+            elif path.is_dir():
+                all_issues = {}
+                file_count = 0
+                for file_path, issues in self.validator.iter_directory(target, extensions,
+                                                                       exclude=exclude,
+                                                                       cache=self.cache):
+                    file_count += 1
+                    if issues is not None:
+                        all_issues[file_path] = issues
+                results = {
+                    'total_files_scanned': file_count,
+                    'files_with_issues': len(all_issues),
+                    'issues': all_issues,
+                }
+            else:
+                raise FileNotFoundError(f"Path not found: {target}")
+
+        if 'error' in results:
+            raise RuntimeError(results['error'])
+
+        # The cached results hold every mode's violations; only the requested ones are returned
+        mode = params.get('mode', 'light')
+        if mode != 'all' and mode not in self.validator.modes:
+            raise ValueError(f"Unknown mode: {mode}")
+        results = self.validator.results_for_mode(results, mode)
+
+        response = {'results': results}
+        if params.get('format') == 'markdown':
+            response['report'] = self.validator.generate_report(results, mode)
+        return response
+
+    def serve_forever(self, socket_path: str) -> None:
+        """Listen on a Unix socket until ``shutdown`` is requested or interrupted"""
+        import socket
+        import socketserver
+        import threading
+
+        if os.path.exists(socket_path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    probe.connect(socket_path)
+                raise RuntimeError(f"A server is already listening on {socket_path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Left behind by a server that did not shut down cleanly
+                os.unlink(socket_path)
+
+        owner = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except ValueError as e:
+                        response = owner._error(None, -32700, f"Parse error: {e}")
+                    else:
+                        response = owner.handle_request(request)
+                    if response is not None:
+                        self.wfile.write(json.dumps(response).encode() + b'\n')
+                        self.wfile.flush()
+                    if owner.stopping:
+                        # shutdown() waits for serve_forever, so it can't run on a handler thread
+                        threading.Thread(target=owner.server.shutdown, daemon=True).start()
+                        return
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        with Server(socket_path, Handler) as server:
+            self.server = server
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                self.cache.save()
+                if os.path.exists(socket_path):
+                    os.unlink(socket_path)
+
+
+def request_server(socket_path: str, method: str, params: Optional[Dict] = None) -> Dict:
+    """Send one JSON-RPC request to a running ``serve`` process and return its result"""
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params or {}}
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        with sock.makefile('rb') as f:
+            response = json.loads(f.readline())
+
+    if 'error' in response:
+        raise RuntimeError(response['error']['message'])
+    return response['result']
+
+
+class IssueWriter:
+    """Stream audit results to a file as machine-readable records
+
+    Subclasses serialize one record per issue as soon as a file's results
+    arrive, so output size is not limited by memory and nothing is truncated.
+    """
+
+    def __init__(self, stream, mode: str = 'light', rules: Optional[List] = None):
+        """Initialize with a writable text stream
+
+        ``rules`` are the rule classes or instances whose issues are written,
+        by default the registry.
+        """
+        self.stream = stream
+        self.mode = mode
+        self.rules = list(RULE_REGISTRY) if rules is None else rules
+        self.files_scanned = 0
+        self.files_with_issues = 0
+        self.issue_count = 0
+        self.begin()
+
+    def add_file(self, file_path: str, issues: Optional[Dict[str, List]]) -> None:
+        """Write all issues of one audited file; ``None`` counts a clean file"""
+        self.files_scanned += 1
+        if issues is None:
+            return
+
+        self.files_with_issues += 1
+        for rule in self.rules:
+            for issue in issues.get(rule.category, []):
+                self.issue_count += 1
+                message = rule.message(issue[rule.key])
+                self.write_issue(self._record(file_path, rule.rule_id, 'error', message, issue))
+        for issue in issues.get('skipped', []):
+            message = f"Not audited: {issue['reason']}"
+            self.write_issue(self._record(file_path, 'skipped', 'note', message, issue))
+
+    def add_results(self, audit_results: Dict) -> None:
+        """Write results already collected by ``audit_directory``/``audit_changes``"""
+        issues = audit_results.get('issues', {})
         for file_path, file_issues in issues.items():
-            color_issues.extend([(file_path, issue) for issue in file_issues.get('colors', [])])
-            spacing_issues.extend([(file_path, issue) for issue in file_issues.get('spacing', [])])
-            radius_issues.extend([(file_path, issue) for issue in file_issues.get('radius', [])])
+            self.add_file(file_path, file_issues)
+        self.files_scanned += audit_results.get('total_files_scanned', 0) - len(issues)
 
-        if color_issues:
-            report += f"### Hardcoded Colors ({len(color_issues)} issues)\n\n"
-            for file_path, issue in color_issues[:10]:  # Limit to first 10
-                report += f"**{file_path}:{issue['line']}**\n"
-                report += f"- Color: `{issue['color']}`\n"
-                report += f"- Line: `{issue['code']}`\n"
-                report += f"- Fix: Use design token instead\n\n"
-            if len(color_issues) > 10:
-                report += f"... and {len(color_issues) - 10} more color issues\n\n"
+    def summary(self) -> Dict:
+        """Counts for the trailer of the output"""
+        return {
+            'mode': self.mode,
+            'total_files_scanned': self.files_scanned,
+            'files_with_issues': self.files_with_issues,
+            'total_issues': self.issue_count,
+        }
 
-        if spacing_issues:
-            report += f"### Non-standard Spacing ({len(spacing_issues)} issues)\n\n"
-            for file_path, issue in spacing_issues[:10]:
-                report += f"**{file_path}:{issue['line']}**\n"
-                report += f"- Value: `{issue['value']}`\n"
-                report += f"- Line: `{issue['code']}`\n"
-                report += f"- Fix: Use spacing token (4, 8, 12, 16, 20, 24, 32, 48, 64px)\n\n"
-            if len(spacing_issues) > 10:
-                report += f"... and {len(spacing_issues) - 10} more spacing issues\n\n"
+    def _record(self, file_path: str, rule_id: str, level: str,
+                message: str, issue: Dict) -> Dict:
+        """Flatten an issue into a self-contained record"""
+        if 'modes' in issue:
+            message += f" (wrong in {', '.join(issue['modes'])} mode)"
+        if 'suggestion' in issue:
+            message += f" (nearest token: {issue['suggestion']['token']} = {issue['suggestion']['value']})"
 
-        if radius_issues:
-            report += f"### Non-standard Border Radius ({len(radius_issues)} issues)\n\n"
-            for file_path, issue in radius_issues[:10]:
-                report += f"**{file_path}:{issue['line']}**\n"
-                report += f"- Value: `{issue['value']}`\n"
-                report += f"- Line: `{issue['code']}`\n"
-                report += f"- Fix: Use border radius token (4, 8, 12, 16px)\n\n"
-            if len(radius_issues) > 10:
-                report += f"... and {len(radius_issues) - 10} more radius issues\n\n"
+        record = {
+            'file': file_path,
+            'line': issue.get('line'),
+            'column': issue.get('column'),
+            'rule': rule_id,
+            'level': level,
+            'message': message,
+        }
+        for key in ('color', 'value', 'modes', 'code', 'suggestion'):
+            if key in issue:
+                record[key] = issue[key]
+        return record
 
-        return report
+    def begin(self) -> None:
+        """Write the output header"""
+
+    def write_issue(self, record: Dict) -> None:
+        """Write one issue record"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Write the output trailer"""
+
+
+class NdjsonIssueWriter(IssueWriter):
+    """One JSON object per line, followed by a summary line"""
+
+    def write_issue(self, record: Dict) -> None:
+        self.stream.write(json.dumps(record) + '\n')
+
+    def close(self) -> None:
+        self.stream.write(json.dumps({'summary': self.summary()}) + '\n')
+
+
+class JsonIssueWriter(IssueWriter):
+    """A single JSON document with an ``issues`` array and a ``summary``"""
+
+    def begin(self) -> None:
+        self.stream.write('{"issues": [')
+        self.separator = '\n  '
+
+    def write_issue(self, record: Dict) -> None:
+        self.stream.write(self.separator + json.dumps(record))
+        self.separator = ',\n  '
+
+    def close(self) -> None:
+        self.stream.write('\n], "summary": ' + json.dumps(self.summary()) + '}\n')
+
+
+class SarifIssueWriter(IssueWriter):
+    """SARIF 2.1.0 log with one run, for code scanning dashboards"""
+
+    SARIF_LEVELS = {'error': 'error', 'note': 'note'}
+
+    def begin(self) -> None:
+        rules = [
+            {'id': rule.rule_id, 'shortDescription': {'text': rule.description()}}
+            for rule in self.rules
+        ]
+        rules.append({'id': 'skipped', 'shortDescription': {'text': 'File or line not audited'}})
+        header = json.dumps({
+            'version': '2.1.0',
+            '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+        })
+        driver = json.dumps({'name': 'acp-design-validator', 'rules': rules})
+        self.stream.write(header[:-1] + ', "runs": [{"tool": {"driver": ' + driver
+                          + '}, "results": [')
+        self.separator = '\n  '
+
+    def write_issue(self, record: Dict) -> None:
+        region = {}
+        if record['line']:
+            region['startLine'] = record['line']
+            if record['column']:
+                region['startColumn'] = record['column']
+            if 'code' in record:
+                region['snippet'] = {'text': record['code']}
+
+        location = {'artifactLocation': {'uri': Path(record['file']).as_posix()}}
+        if region:
+            location['region'] = region
+
+        result = {
+            'ruleId': record['rule'],
+            'level': self.SARIF_LEVELS[record['level']],
+            'message': {'text': record['message']},
+            'locations': [{'physicalLocation': location}],
+        }
+        self.stream.write(self.separator + json.dumps(result))
+        self.separator = ',\n  '
+
+    def close(self) -> None:
+        self.stream.write('\n], "properties": ' + json.dumps(self.summary()) + '}]}\n')
+
+
+ISSUE_WRITERS = {
+    'json': JsonIssueWriter,
+    'ndjson': NdjsonIssueWriter,
+    'sarif': SarifIssueWriter,
+}
+
+
+def _single_file_results(file_path: str, issues: Dict[str, List]) -> Dict:
+    """Wrap audit_file output in the audit_directory result shape"""
+    if 'errors' in issues:
+        return {'error': issues['errors'][0]}
+    has_issues = any(issues.values())
+    return {
+        'total_files_scanned': 1,
+        'files_with_issues': 1 if has_issues else 0,
+        'issues': {file_path: issues} if has_issues else {},
+    }
+
+
+def _write_report(validator: DesignValidator, args: argparse.Namespace,
+                  path: Path, status) -> int:
+    """Run the audit for main() and print or save the markdown report"""
+    if args.changed_since or args.staged:
+        print(f"Auditing changed lines: {args.path}", file=status)
+        results = validator.audit_changes(args.path, args.changed_since, args.staged,
+                                          args.extensions, args.exclude)
+    elif path.is_file():
+        print(f"Auditing file: {args.path}", file=status)
+        results = _single_file_results(args.path, validator.audit_file(args.path))
+    else:
+        print(f"Auditing directory: {args.path}", file=status)
+        results = validator.audit_directory(args.path, args.extensions, args.jobs,
+                                            args.exclude, args.cache)
+
+    if 'error' in results:
+        raise RuntimeError(results['error'])
+
+    results = validator.results_for_mode(results, args.mode)
+    report = validator.generate_report(results, args.mode)
+
+    if args.output:
+        Path(args.output).write_text(report)
+        print(f"✓ Report written to: {args.output}")
+    else:
+        print(report)
+
+    # Return exit code based on issues found
+    issues_count = sum(count_issues(v) for v in results.get('issues', {}).values())
+    return 1 if issues_count > 0 else 0
+
+
+def _write_issues(validator: DesignValidator, args: argparse.Namespace,
+                  path: Path, status) -> int:
+    """Run the audit for main() and stream it through an IssueWriter"""
+    # Resolve everything that can fail before the output header is written
+    if args.changed_since or args.staged:
+        print(f"Auditing changed lines: {args.path}", file=status)
+        results = validator.audit_changes(args.path, args.changed_since, args.staged,
+                                          args.extensions, args.exclude)
+    elif path.is_file():
+        print(f"Auditing file: {args.path}", file=status)
+        results = _single_file_results(args.path, validator.audit_file(args.path))
+    elif path.is_dir():
+        print(f"Auditing directory: {args.path}", file=status)
+        results = None
+    else:
+        results = {'error': f"Path not found: {args.path}"}
+
+    if results is not None and 'error' in results:
+        raise RuntimeError(results['error'])
+
+    stream = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        writer = ISSUE_WRITERS[args.format](stream, args.mode, validator.rules)
+        if results is not None:
+            writer.add_results(validator.results_for_mode(results, args.mode))
+        else:
+            for file_path, issues in validator.iter_directory(args.path, args.extensions, args.jobs,
+                                                              args.exclude, args.cache):
+                writer.add_file(file_path, validator.issues_for_mode(issues, args.mode))
+        writer.close()
+    finally:
+        if args.output:
+            stream.close()
+
+    if args.output:
+        print(f"✓ Report written to: {args.output}", file=status)
+    return 1 if writer.issue_count > 0 else 0
+
+
+def _run_fixes(validator: DesignValidator, args: argparse.Namespace) -> int:
+    """Apply or diff token rewrites for main()
+
+    Diffs go to stdout and progress to stderr, so a dry run can be piped
+    into a patch file.
+    """
+    edit_count = 0
+    fixed_files = 0
+    for result in validator.iter_fixes(args.path, args.extensions, args.jobs,
+                                       args.exclude, args.dry_run):
+        if 'error' in result:
+            print(f"⚠ Skipped {result['file']}: {result['error']}", file=sys.stderr)
+            continue
+        if not result['edits']:
+            continue
+        edit_count += result['edits']
+        fixed_files += 1
+        if result['diff']:
+            sys.stdout.write(result['diff'])
+        if result['needs_import']:
+            print(f"⚠ {result['file']} now uses designTokens; add its import", file=sys.stderr)
+
+    verb = 'Would rewrite' if args.dry_run else 'Rewrote'
+    print(f"✓ {verb} {edit_count} literal(s) in {fixed_files} file(s)", file=sys.stderr)
+    return 0
+
+
+def _serve_main(argv: List[str]) -> int:
+    """Run the resident validator server"""
+    parser = argparse.ArgumentParser(
+        prog='design-validator.py serve',
+        description='Keep a design validator resident and answer audits over a Unix socket'
+    )
+
+    parser.add_argument('--socket', default='.design-validator.sock',
+                        help='Unix socket path (default: .design-validator.sock)')
+    parser.add_argument('--tokens', help='Path to design-tokens.json file')
+    parser.add_argument('--cache', help='Load the result cache from and save it to this file')
+    parser.add_argument('--max-file-size', type=int,
+                        help='Skip files larger than this many bytes')
+    parser.add_argument('--max-line-length', type=int,
+                        help='Skip lines longer than this many characters')
+    parser.add_argument('--no-venv-reexec', action='store_true',
+                        help='Run in the current interpreter instead of the project .venv')
+
+    args = parser.parse_args(argv)
+
+    try:
+        validator = DesignValidator(args.tokens, args.max_file_size, args.max_line_length)
+        server = ValidatorServer(validator, args.cache)
+        print(f"Serving design audits on {args.socket}, press Ctrl+C to stop", flush=True)
+        server.serve_forever(args.socket)
+        return 0
+    except Exception as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _client_main(argv: List[str]) -> int:
+    """Send one audit to a running server and print its result"""
+    parser = argparse.ArgumentParser(
+        prog='design-validator.py client',
+        description='Audit through a running `design-validator.py serve` process'
+    )
+
+    parser.add_argument('--socket', default='.design-validator.sock',
+                        help='Unix socket path (default: .design-validator.sock)')
+    parser.add_argument('--path', required=True,
+                        help='File or directory path to audit')
+    parser.add_argument('--mode', choices=['light', 'dark', 'all'], default='light',
+                        help='Color mode to report violations for; colors in blocks scoped '
+                             'to another mode are not shown, all shows every mode (default: light)')
+    parser.add_argument('--format', choices=['markdown', 'json'], default='markdown',
+                        help='Print a Markdown report or the raw JSON results (default: markdown)')
+    parser.add_argument('--extensions', nargs='+',
+                        help='File extensions to audit')
+    parser.add_argument('--exclude', nargs='+',
+                        help='.gitignore-style patterns for paths to skip; !pattern re-includes, the last match wins')
+    changes = parser.add_mutually_exclusive_group()
+    changes.add_argument('--changed-since', metavar='REF',
+                         help='Only audit lines changed since a git ref')
+    changes.add_argument('--staged', action='store_true',
+                         help='Only audit lines changed in the git index')
+    parser.add_argument('--no-venv-reexec', action='store_true',
+                        help='Run in the current interpreter instead of the project .venv')
+
+    args = parser.parse_args(argv)
+
+    params = {
+        # The server may run from another directory
+        'path': os.path.abspath(args.path),
+        'mode': args.mode,
+        'format': args.format,
+        'extensions': args.extensions,
+        'exclude': args.exclude,
+        'changed_since': args.changed_since,
+        'staged': args.staged,
+    }
+
+    try:
+        response = request_server(args.socket, 'audit', params)
+    except Exception as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.format == 'markdown':
+        print(response['report'])
+    else:
+        print(json.dumps(response['results'], indent=2))
+
+    issues_count = sum(count_issues(v) for v in response['results'].get('issues', {}).values())
+    return 1 if issues_count > 0 else 0
+
+
+# Flags every command accepts, so they may also come before the command name
+GLOBAL_FLAGS = ('--no-venv-reexec',)
 
 
 def main():
+    argv = sys.argv[1:]
+    leading = []
+    while argv and argv[0] in GLOBAL_FLAGS:
+        leading.append(argv.pop(0))
+    command = argv[0] if argv else None
+    if command in ('serve', 'client', 'audit'):
+        # `audit` is the default command and may be spelled out
+        argv = argv[1:]
+    argv = leading + argv
+    if command == 'serve':
+        return _serve_main(argv)
+    if command == 'client':
+        return _client_main(argv)
+
     parser = argparse.ArgumentParser(
-        description='Validate code for ACP design token compliance'
+        description='Validate code for ACP design token compliance',
+        epilog='Other commands: `serve` keeps a validator resident on a Unix socket, '
+               '`client` audits through it. Run them with --help for options.'
     )
 
     parser.add_argument('--path', required=True,
                         help='File or directory path to audit')
-    parser.add_argument('--mode', choices=['light', 'dark'], default='light',
-                        help='Color mode for validation (default: light)')
+    parser.add_argument('--mode', choices=['light', 'dark', 'all'], default='light',
+                        help='Color mode to report violations for; colors in blocks scoped '
+                             'to another mode are not shown, all shows every mode (default: light)')
     parser.add_argument('--tokens', help='Path to design-tokens.json file')
     parser.add_argument('--output', help='Output file for report (default: print to stdout)')
+    parser.add_argument('--format', choices=['markdown'] + sorted(ISSUE_WRITERS), default='markdown',
+                        help='Report format; json, ndjson and sarif list every issue and are '
+                             'written while the audit runs (default: markdown)')
     parser.add_argument('--extensions', nargs='+',
                         default=['.tsx', '.ts', '.jsx', '.js', '.css', '.scss'],
                         help='File extensions to audit')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes for directory audits (0 = all CPUs, default: 1)')
+    parser.add_argument('--exclude', nargs='+', default=[],
+                        help='.gitignore-style patterns for paths to skip; !pattern re-includes, the last match wins')
+    parser.add_argument('--max-file-size', type=int,
+                        help='Skip files larger than this many bytes')
+    parser.add_argument('--max-line-length', type=int,
+                        help='Skip lines longer than this many characters')
+    changes = parser.add_mutually_exclusive_group()
+    changes.add_argument('--changed-since', metavar='REF',
+                         help='Only audit lines changed since a git ref')
+    changes.add_argument('--staged', action='store_true',
+                         help='Only audit lines changed in the git index')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and re-audit files as they change')
+    parser.add_argument('--no-venv-reexec', action='store_true',
+                        help='Run in the current interpreter instead of the project .venv')
+    parser.add_argument('--cache', nargs='?', const='.design-validator-cache',
+                        help='Reuse results for unchanged files from a cache file '
+                             '(default when given: .design-validator-cache)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print time and issue counts per rule to stderr')
+    parser.add_argument('--fix', action='store_true',
+                        help='Rewrite colors, spacing, radii and font sizes that equal a '
+                             'design token into token references')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='With --fix, print a diff instead of writing files')
+
+    args = parser.parse_args(argv)
+    if args.dry_run and not args.fix:
+        parser.error('--dry-run needs --fix')
+    if args.fix and (args.watch or args.changed_since or args.staged):
+        parser.error('--fix cannot be combined with --watch, --changed-since or --staged')
 
-    args = parser.parse_args()
+    # Keep stdout clean for machine-readable output
+    status = sys.stdout if args.format == 'markdown' or args.output else sys.stderr
 
     try:
-        validator = DesignValidator(args.tokens)
+        validator = DesignValidator(args.tokens, args.max_file_size, args.max_line_length,
+                                    args.profile)
         path = Path(args.path)
+        if args.profile and args.jobs != 1:
+            # Rule timings are collected in this process
+            print("--profile audits serially, ignoring --jobs", file=sys.stderr)
+            args.jobs = 1
 
-        if path.is_file():
-            print(f"Auditing file: {args.path}")
-            results = validator.audit_file(args.path)
-        else:
-            print(f"Auditing directory: {args.path}")
-            results = validator.audit_directory(args.path, args.extensions)
+        if args.fix:
+            return _run_fixes(validator, args)
 
-        report = validator.generate_report(results, args.mode)
+        if args.watch:
+            if not path.is_dir():
+                raise RuntimeError(f"--watch needs a directory: {args.path}")
+            validator.watch(args.path, args.extensions, args.exclude, args.jobs, mode=args.mode)
+            return 0
 
-        if args.output:
-            Path(args.output).write_text(report)
-            print(f"✓ Report written to: {args.output}")
+        if args.format != 'markdown':
+            exit_code = _write_issues(validator, args, path, status)
         else:
-            print(report)
+            exit_code = _write_report(validator, args, path, status)
 
-        # Return exit code based on issues found
-        issues_count = sum(
-            len(v.get('colors', [])) + len(v.get('spacing', [])) + len(v.get('radius', []))
-            for v in results.get('issues', {}).values()
-        )
-        return 1 if issues_count > 0 else 0
+        if args.profile:
+            print(validator.format_profile(), file=sys.stderr)
+        return exit_code
 
     except Exception as e:
         print(f"✗ Error: {e}", file=sys.stderr)
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+ACP Design Tokens Schema
+
+Validates and normalizes design-tokens.json so that the converter and the
+validator read the same, cleaned-up token values:
+- colors: lowercase #rrggbb (3/4-digit hex expanded, opaque rgb()/hsl()
+  converted); translucent colors and keywords kept in lowercase
+- lengths: lowercase units, bare numbers as px
+- names: surrounding whitespace removed, inner whitespace as '-'
+
+References such as ``{colors.primary.main}`` are accepted wherever a value
+is expected. Files may be partial (brand overlays), so every key is
+optional and references are resolved once the files are merged
+(``resolve_table``); resolved values are then checked like literal ones.
+
+The schema is compiled once into nested checker functions, and normalized
+token sets are cached by the SHA-256 of their source bytes, so loading an
+unchanged file again costs one hash.
+
+Usage:
+    python3 design_tokens_schema.py tokens/design-tokens.json [--print]
+"""
+
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# CSS color functions accepted by normalize_color
+COLOR_FUNCTION_PATTERN = re.compile(
+    r'^(rgba?|hsla?)\(\s*([-\d.]+)(deg|%)?[\s,]+([-\d.]+)(%?)[\s,]+([-\d.]+)(%?)'
+    r'(?:\s*[,/]\s*([\d.]+)(%?))?\s*\)$'
+)
+
+# Token names must work as CSS custom property parts, TypeScript keys and reference paths
+NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+LENGTH_PATTERN = re.compile(r'^(-?(?:\d+\.?\d*|\.\d+))(px|rem|em|%|vh|vw|ch|ex)?$')
+
+REFERENCE_PATTERN = re.compile(r'\{[^{}\s]+\}')
+
+KEYWORD_COLORS = frozenset({'transparent', 'currentcolor', 'inherit'})
+
+# Normalized token sets kept per source hash
+CACHE_SIZE = 32
+
+
+def normalize_color(value: str) -> Optional[str]:
+    """Normalize a hex, rgb() or hsl() color to lowercase #rrggbb
+
+    Returns None for values that are not opaque colors in one of these forms.
+    """
+    value = value.strip().lower()
+    if value.startswith('#'):
+        digits = value[1:]
+        if len(digits) in (3, 4):
+            digits = ''.join(c * 2 for c in digits)
+        if len(digits) == 8 and digits.endswith('ff'):
+            digits = digits[:6]
+        if len(digits) != 6 or any(c not in '0123456789abcdef' for c in digits):
+            return None
+        return '#' + digits
+
+    match = COLOR_FUNCTION_PATTERN.match(value)
+    if not match:
+        return None
+    func, a, a_unit, b, b_pct, c, c_pct, alpha, alpha_pct = match.groups()
+    if alpha is not None and float(alpha) < (100 if alpha_pct else 1):
+        return None
+
+    if func.startswith('rgb'):
+        channels = [
+            float(x) * 2.55 if pct else float(x)
+            for x, pct in ((a, a_unit == '%'), (b, b_pct), (c, c_pct))
+        ]
+    else:
+        hue = float(a) % 360 / 360
+        sat = float(b) / 100
+        light = float(c) / 100
+        q = light * (1 + sat) if light < 0.5 else light + sat - light * sat
+        p = 2 * light - q
+
+        def channel(t: float) -> float:
+            t %= 1
+            if t < 1 / 6:
+                return p + (q - p) * 6 * t
+            if t < 1 / 2:
+                return q
+            if t < 2 / 3:
+                return p + (q - p) * (2 / 3 - t) * 6
+            return p
+
+        channels = [channel(hue + 1 / 3) * 255, channel(hue) * 255, channel(hue - 1 / 3) * 255]
+
+    return '#' + ''.join(f"{min(255, max(0, round(x))):02x}" for x in channels)
+
+
+class TokenSchemaError(ValueError):
+    """A token file does not match the schema; ``errors`` lists every problem"""
+
+    MAX_SHOWN = 20
+
+    def __init__(self, source: str, errors: List[str]):
+        self.errors = errors
+        shown = '\n  '.join(errors[:self.MAX_SHOWN])
+        more = f"\n  ... and {len(errors) - self.MAX_SHOWN} more" if len(errors) > self.MAX_SHOWN else ''
+        super().__init__(f"Invalid tokens in {source}:\n  {shown}{more}")
+
+
+def _color(value: Any) -> str:
+    """Normalize a color token"""
+    if not isinstance(value, str):
+        raise ValueError(f"expected a color string, got {value!r}")
+    color = normalize_color(value)
+    if color:
+        return color
+    text = ' '.join(value.strip().lower().split())
+    if re.fullmatch(r'#[0-9a-f]{4}', text):
+        text = '#' + ''.join(c * 2 for c in text[1:])
+    if text in KEYWORD_COLORS or re.fullmatch(r'#[0-9a-f]{8}', text) or COLOR_FUNCTION_PATTERN.match(text):
+        return text
+    raise ValueError(f"not a color: {value!r}")
+
+
+def _length(value: Any) -> str:
+    """Normalize a length token; bare numbers other than 0 are px"""
+    if isinstance(value, bool):
+        raise ValueError(f"expected a length, got {value!r}")
+    if isinstance(value, (int, float)):
+        return '0' if value == 0 else f"{value:g}px"
+    if not isinstance(value, str):
+        raise ValueError(f"expected a length, got {value!r}")
+    match = LENGTH_PATTERN.match(value.strip().lower())
+    if not match:
+        raise ValueError(f"not a length: {value!r}")
+    number, unit = match.groups()
+    if unit is None and float(number) != 0:
+        unit = 'px'
+    return number + (unit or '')
+
+
+def _numeric(value: Any) -> Any:
+    """Numbers stay numbers, numeric strings become numbers, keywords are kept"""
+    if isinstance(value, bool):
+        raise ValueError(f"expected a number, got {value!r}")
+    if isinstance(value, (int, float)):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"expected a number, got {value!r}")
+    text = value.strip()
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    return int(number) if number.is_integer() and '.' not in text else number
+
+
+def _font(value: Any) -> str:
+    """A font stack, given as one string or a list of families"""
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return ', '.join(item.strip() for item in value)
+    if isinstance(value, str):
+        return value.strip()
+    raise ValueError(f"expected a font stack, got {value!r}")
+
+
+def _text(value: Any) -> str:
+    """Any other string token"""
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"expected a string, got {value!r}")
+    return str(value).strip()
+
+
+def _any(value: Any, path: str, errors: List[str]) -> Any:
+    """Keys the schema does not know are passed through unchecked"""
+    return value
+
+
+TOKEN_SCHEMA = {
+    'version': _text,
+    'description': _text,
+    'modes': {'*': {'colors': {'*': {'*': _color}}}},
+    'spacing': {'*': _length},
+    'typography': {
+        'sizes': {'*': _length},
+        'weights': {'*': _numeric},
+        'lineHeights': {'*': _numeric},
+        'fontFamily': _font,
+    },
+    'effects': {
+        'shadows': {'*': _text},
+        'radii': {'*': _length},
+        'transitions': {'*': _text},
+        'zIndex': {'*': _numeric},
+    },
+}
+
+
+def normalize_name(name: str) -> str:
+    """Strip a token name and join inner whitespace with '-'"""
+    return '-'.join(name.split())
+
+
+def _compile(spec: Any) -> Callable[[Any, str, List[str]], Any]:
+    """Turn a schema node into a checker ``(value, path, errors) -> normalized value``
+
+    Objects list their known keys, with '*' for keys named by the token
+    author; leaves are normalizer functions that raise ValueError.
+    """
+    if callable(spec):
+        def check_leaf(value: Any, path: str, errors: List[str]) -> Any:
+            if isinstance(value, str) and '{' in value and REFERENCE_PATTERN.search(value):
+                return value.strip()
+            try:
+                return spec(value)
+            except ValueError as e:
+                errors.append(f"{path}: {e}")
+                return value
+        return check_leaf
+
+    fields = {key: _compile(sub) for key, sub in spec.items() if key != '*'}
+    wildcard = _compile(spec['*']) if '*' in spec else None
+
+    def check_object(value: Any, path: str, errors: List[str]) -> Any:
+        if not isinstance(value, dict):
+            errors.append(f"{path or 'tokens'}: expected an object, got {type(value).__name__}")
+            return value
+        normalized = {}
+        for key, item in value.items():
+            checker = fields.get(key)
+            if checker is None and wildcard is not None:
+                checker = wildcard
+                key = normalize_name(key)
+                if not NAME_PATTERN.match(key):
+                    errors.append(f"{path}: invalid token name {key!r} (use letters, digits, '_' and '-')")
+            item_path = f"{path}.{key}" if path else key
+            if key in normalized:
+                errors.append(f"{item_path}: defined twice")
+            normalized[key] = (checker or _any)(item, item_path, errors)
+        return normalized
+
+    return check_object
+
+
+# Compiled once; checking a token set is then a single walk
+_check_tokens = _compile(TOKEN_SCHEMA)
+
+_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def _leaf_spec(key: str) -> Optional[Callable[[Any], Any]]:
+    """Normalizer of the schema leaf at a dotted path, None if the schema has none"""
+    spec: Any = TOKEN_SCHEMA
+    for part in key.split('.'):
+        if not isinstance(spec, dict):
+            return None
+        spec = spec.get(part, spec.get('*'))
+        if spec is None:
+            return None
+    return spec if callable(spec) else None
+
+
+class TokenResolver:
+    """Resolve ``{path.to.token}`` references over a flat token table
+
+    The table maps dotted paths (``spacing.px4``,
+    ``modes.dark.colors.text.primary``) to leaf values. A value that is
+    exactly one reference takes the referenced value as is; references
+    inside a longer string (``calc({spacing.px4} * 2)``) are substituted as
+    text. ``{colors...}`` means the referring mode's colors, falling back
+    to the default mode's (always used outside modes). Every token is resolved once, in
+    dependency order, so the whole table takes linear time; cycles and
+    unknown references raise ValueError.
+    """
+
+    REFERENCE = re.compile(r'\{([^{}\s]+)\}')
+
+    def __init__(self, table: Dict[str, Any], default_mode: str = 'light'):
+        self.table = table
+        self.default_mode = default_mode
+        self.resolved: Dict[str, Any] = {}
+
+    def resolve_all(self) -> Dict[str, Any]:
+        """Resolve every token, returning the flat table in source order"""
+        for key in self.table:
+            self.resolve(key)
+        return {key: self.resolved[key] for key in self.table}
+
+    def resolve(self, key: str) -> Any:
+        """Resolve one token, resolving whatever it depends on first"""
+        if key in self.resolved:
+            return self.resolved[key]
+
+        # Depth-first walk with an explicit stack, so long alias chains do not
+        # hit the recursion limit; tokens on the stack are the current path.
+        stack = [(key, iter(self._references(key)))]
+        on_path = {key}
+        while stack:
+            current, references = stack[-1]
+            for target in references:
+                if target in self.resolved:
+                    continue
+                if target in on_path:
+                    chain = [k for k, _ in stack]
+                    chain = chain[chain.index(target):] + [target]
+                    raise ValueError(f"Token reference cycle: {' -> '.join(chain)}")
+                stack.append((target, iter(self._references(target))))
+                on_path.add(target)
+                break
+            else:
+                stack.pop()
+                on_path.discard(current)
+                self.resolved[current] = self._substitute(current)
+        return self.resolved[key]
+
+    def _target(self, key: str, reference: str) -> str:
+        """Table key a reference made from ``key`` points to"""
+        if key.startswith('modes.'):
+            scoped = f"modes.{key.split('.', 2)[1]}.{reference}"
+            if scoped in self.table:
+                return scoped
+        if reference in self.table:
+            return reference
+        if reference.startswith('colors.'):
+            scoped = f"modes.{self.default_mode}.{reference}"
+            if scoped in self.table:
+                return scoped
+        raise ValueError(f"Unknown token reference {{{reference}}} in {key}")
+
+    def _references(self, key: str) -> List[str]:
+        """Table keys that the value of ``key`` refers to"""
+        value = self.table[key]
+        if not isinstance(value, str) or '{' not in value:
+            return []
+        return [self._target(key, ref) for ref in self.REFERENCE.findall(value)]
+
+    def _substitute(self, key: str) -> Any:
+        """Value of ``key`` with its (already resolved) references filled in"""
+        value = self.table[key]
+        if not isinstance(value, str) or '{' not in value:
+            return value
+        whole = self.REFERENCE.fullmatch(value)
+        if whole:
+            return self.resolved[self._target(key, whole.group(1))]
+        return self.REFERENCE.sub(
+            lambda m: str(self.resolved[self._target(key, m.group(1))]), value)
+
+
+def flatten_tokens(tree: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """Map the dotted path of every leaf (non-object value) to its value"""
+    table = {}
+    for key, value in tree.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            table.update(flatten_tokens(value, path + '.'))
+        else:
+            table[path] = value
+    return table
+
+
+def rebuild_tokens(tree: Dict[str, Any], table: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """Copy of ``tree`` with each leaf taken from the flat ``table``"""
+    return {
+        key: (rebuild_tokens(value, table, f"{prefix}{key}.")
+              if isinstance(value, dict) else table[f"{prefix}{key}"])
+        for key, value in tree.items()
+    }
+
+
+def default_mode(tokens: Dict[str, Any]) -> str:
+    """The mode that fills ``{colors...}`` outside modes: light, else the first one"""
+    modes = list(tokens.get('modes', {}))
+    return 'light' if 'light' in modes or not modes else modes[0]
+
+
+def resolve_table(tokens: Dict[str, Any], mode: Optional[str] = None,
+                  source: str = 'tokens') -> Dict[str, Any]:
+    """Resolve the references of a complete token set into a flat table
+
+    A value that is exactly one reference is normalized again as its
+    schema leaf, so ``spacing.s: "{colors.primary.main}"`` is rejected like
+    a literal color would be. References inside a longer string
+    (``calc({spacing.px4} * 2)``) must point at the same kind of token,
+    except in free-form text tokens such as shadows. Raises
+    TokenSchemaError listing every problem.
+    """
+    table = flatten_tokens(tokens)
+    resolver = TokenResolver(table, mode or default_mode(tokens))
+    resolved = resolver.resolve_all()
+    errors: List[str] = []
+    for key, value in table.items():
+        if resolved[key] is value:
+            continue
+        spec = _leaf_spec(key)
+        if spec is None:
+            continue
+        if resolver.REFERENCE.fullmatch(value):
+            try:
+                resolved[key] = spec(resolved[key])
+            except ValueError as e:
+                errors.append(f"{key}: {e} (from {value})")
+        elif spec is not _text:
+            for target in resolver._references(key):
+                if _leaf_spec(target) is not spec:
+                    errors.append(f"{key}: {{{target}}} is a different kind of token (in {value!r})")
+    if errors:
+        raise TokenSchemaError(source, errors)
+    return resolved
+
+
+def normalize_tokens(tokens: Any, source: str = 'tokens') -> Dict[str, Any]:
+    """Validate a parsed token set and return its normalized copy
+
+    Raises TokenSchemaError listing every problem found.
+    """
+    errors: List[str] = []
+    normalized = _check_tokens(tokens, '', errors)
+    if errors:
+        raise TokenSchemaError(source, errors)
+    return normalized
+
+
+def load_tokens(path, resolve: bool = False) -> Dict[str, Any]:
+    """Read, validate and normalize a token file, reusing the result for identical content
+
+    With ``resolve`` the file must be a complete token set and its
+    references are resolved. The returned object is shared between callers
+    and must not be modified.
+    """
+    import hashlib
+
+    data = Path(path).read_bytes()
+    key = hashlib.sha256(data).hexdigest() + (':resolved' if resolve else '')
+    tokens = _cache.get(key)
+    if tokens is None:
+        try:
+            raw = json.loads(data)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in {path}: {e}") from e
+        tokens = normalize_tokens(raw, str(path))
+        if resolve:
+            tokens = rebuild_tokens(tokens, resolve_table(tokens, source=str(path)))
+        if len(_cache) >= CACHE_SIZE:
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = tokens
+    return tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Validate and normalize an ACP design tokens file'
+    )
+
+    parser.add_argument('path', help='Token file to check')
+    parser.add_argument('--print', dest='print_tokens', action='store_true',
+                        help='Print the normalized tokens as JSON')
+    parser.add_argument('--resolve', action='store_true',
+                        help='Also resolve references, for a complete token set')
+
+    args = parser.parse_args()
+
+    try:
+        tokens = load_tokens(args.path, resolve=args.resolve)
+    except Exception as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.print_tokens:
+        print(json.dumps(tokens, indent=2))
+    modes = tokens.get('modes', {})
+    print(f"✓ Valid tokens: {args.path} ({len(modes)} mode(s))", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())